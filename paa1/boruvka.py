@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Algoritmo de Boruvka paralelo para arvore geradora minima.
+
+Kruskal (`kruskal.py`) examina as arestas uma a uma, em ordem. Boruvka
+trabalha em rodadas: em cada rodada, todo componente escolhe sua aresta de
+saida mais barata e todas essas arestas sao inseridas de uma vez. O numero
+de componentes cai pelo menos pela metade por rodada, logo ha O(log V)
+rodadas.
+
+A busca das arestas minimas e a parte cara (O(E) por rodada) e e
+independente entre arestas, entao e dividida em blocos processados por um
+conjunto de processos (`multiprocessing.Pool`):
+
+1. As arestas (u, v, posto) e o vetor comp[x] (componente de cada nodo)
+   ficam em memoria compartilhada (`multiprocessing.shared_memory`), sem
+   copias por tarefa.
+2. Cada processo devolve, para o seu bloco, a menor aresta de saida de cada
+   componente que encontrou.
+3. O processo principal combina os minimos dos blocos, une os componentes
+   com um union-find unico e reescreve comp[] para a rodada seguinte.
+   Arestas internas a um componente sao descartadas (compactacao).
+
+Desempate: o posto de uma aresta e sua posicao na ordenacao estavel por
+peso. Como os postos sao distintos, nao ha ciclos entre as escolhas e a
+arvore obtida e exatamente a de `kruskal(v, e)` (mesmo conjunto de arestas),
+ja que Kruskal usa a mesma ordem para empates.
+"""
+
+import os
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+
+def _minimos(u, v, comp, inicio, fim):
+    """
+    Menor aresta de saida de cada componente, no bloco [inicio, fim).
+    Devolve (componentes, posicoes), ambos vetores NumPy.
+
+    As arestas estao em ordem crescente de posto (e a compactacao preserva
+    essa ordem), entao a menor posicao e tambem o menor posto.
+    """
+    cu = comp[u[inicio:fim]]
+    cv = comp[v[inicio:fim]]
+    rb = np.arange(inicio, fim, dtype=np.int64)
+    saida = cu != cv
+    c = np.concatenate((cu[saida], cv[saida]))   # a aresta sai dos dois componentes
+    k = np.concatenate((rb[saida], rb[saida]))
+    melhor = np.full(len(comp), fim, dtype=np.int64)
+    np.minimum.at(melhor, c, k)
+    achou = np.nonzero(melhor < fim)[0]
+    return achou, melhor[achou]
+
+
+# Estado de cada processo trabalhador: visoes da memoria compartilhada.
+_compartilhado = {}
+
+
+def _inicia_trabalhador(nomes, m, n):
+    for campo, nome in nomes.items():
+        shm = shared_memory.SharedMemory(name=nome)
+        tamanho = n if campo == 'comp' else m
+        _compartilhado[campo] = (shm, np.ndarray((tamanho,), dtype=np.int64, buffer=shm.buf))
+
+
+def _tarefa(intervalo):
+    d = {campo: arr for campo, (_, arr) in _compartilhado.items()}
+    return _minimos(d['u'], d['v'], d['comp'], intervalo[0], intervalo[1])
+
+
+def _raizes(p, x):
+    # raizes de x por saltos de ponteiro vetorizados
+    r = p[x]
+    while True:
+        rr = p[r]
+        if np.array_equal(rr, r):
+            return r
+        r = rr
+
+
+def boruvka_estruturado(arestas, n, processos=None, tamanho_bloco=1 << 20):
+    """
+    Boruvka sobre um vetor estruturado (u, v, w) com nodos 0, ..., n-1.
+
+    Parametros:
+        arestas: vetor estruturado com campos 'u', 'v' e 'w'.
+        n: numero de nodos.
+        processos: tamanho do pool (None = os.cpu_count(); 1 = sem pool).
+        tamanho_bloco: numero de arestas por tarefa.
+
+    Devolve os indices (em `arestas`) das arestas da arvore (ou floresta)
+    geradora minima, na ordem em que foram inseridas.
+    """
+    m = len(arestas)
+    if processos is None:
+        processos = os.cpu_count() or 1
+
+    ordem = np.argsort(np.asarray(arestas['w']), kind='stable')  # ordem[posto] = aresta
+    campos = {
+        'u': np.asarray(arestas['u'], dtype=np.int64)[ordem],
+        'v': np.asarray(arestas['v'], dtype=np.int64)[ordem],
+        'r': np.arange(m, dtype=np.int64),
+        'comp': np.arange(n, dtype=np.int64),
+    }
+
+    shms = []
+    pool = None
+    try:
+        if processos > 1:
+            # copia as arestas e comp para memoria compartilhada
+            for campo in list(campos):
+                dados = campos[campo]
+                shm = shared_memory.SharedMemory(create=True, size=max(dados.nbytes, 8))
+                shms.append(shm)
+                campos[campo] = np.ndarray(dados.shape, dtype=np.int64, buffer=shm.buf)
+                campos[campo][:] = dados
+            nomes = {campo: shm.name for campo, shm in zip(campos, shms)}
+            pool = Pool(processos, initializer=_inicia_trabalhador, initargs=(nomes, m, n))
+
+        u, v, r, comp = campos['u'], campos['v'], campos['r'], campos['comp']
+        p = np.arange(n, dtype=np.int64)      # union-find sobre os componentes
+        s = np.ones(n, dtype=np.int64)
+        res = []
+        vivas = m                             # arestas em [0, vivas) ainda saem de componentes
+
+        while vivas > 0:
+            blocos = [(i, min(i + tamanho_bloco, vivas)) for i in range(0, vivas, tamanho_bloco)]
+            if pool is not None:
+                parciais = pool.map(_tarefa, blocos)
+            else:
+                parciais = [_minimos(u, v, comp, i, f) for (i, f) in blocos]
+
+            # combina os minimos de todos os blocos
+            melhor = np.full(n, m, dtype=np.int64)
+            for (c, k) in parciais:
+                np.minimum.at(melhor, c, k)
+            escolhidas = np.unique(melhor[melhor < m])  # dois componentes podem escolher a mesma
+            if len(escolhidas) == 0:
+                break
+
+            # contracao: une os componentes ligados pelas arestas escolhidas
+            # (laco escalar sobre listas Python, mais rapidas que escalares NumPy)
+            pl, sl = p.tolist(), s.tolist()
+            originais = ordem[r[escolhidas]].tolist()       # r[pos] = posto original
+            for a, b, orig in zip(comp[u[escolhidas]].tolist(),
+                                  comp[v[escolhidas]].tolist(), originais):
+                while pl[a] != a:
+                    a = pl[a]
+                while pl[b] != b:
+                    b = pl[b]
+                if a == b:
+                    continue
+                res.append(orig)
+                if sl[a] < sl[b]:
+                    a, b = b, a
+                pl[b] = a
+                sl[a] += sl[b]
+            p[:] = pl
+            s[:] = sl
+
+            comp[:] = _raizes(p, comp)
+
+            # compactacao: mantem apenas arestas entre componentes distintos
+            saida = np.nonzero(comp[u[:vivas]] != comp[v[:vivas]])[0]
+            vivas = len(saida)
+            u[:vivas] = u[saida]
+            v[:vivas] = v[saida]
+            r[:vivas] = r[saida]
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+    return np.array(res, dtype=np.int64)
+
+
+def boruvka(v, e, processos=None, tamanho_bloco=1 << 20):
+    """
+    Mesma interface de `kruskal(v, e)`. Devolve as mesmas arestas de Kruskal,
+    na ordem em que Boruvka as inseriu.
+    """
+    nome = {x: i for i, x in enumerate(v)}
+    tipo_w = np.int64 if all(isinstance(a[1], int) for a in e) else np.float64
+    arestas = np.empty(len(e), dtype=[('u', np.int64), ('v', np.int64), ('w', tipo_w)])
+    for i, ((x, y), peso) in enumerate(e):
+        arestas[i] = (nome[x], nome[y], peso)
+    escolhidas = boruvka_estruturado(arestas, len(v), processos, tamanho_bloco)
+    return [e[i] for i in escolhidas.tolist()]
+
+
+def _run_tests():
+    import random
+    from kruskal import kruskal, v, e
+
+    for processos in (1, 2):
+        assert set(boruvka(v, e, processos)) == set(kruskal(v, e))
+
+    # muitos empates, lacos e arestas paralelas, grafo possivelmente desconexo
+    rng = random.Random(0)
+    for n, m in ((40, 30), (40, 300), (200, 2000)):
+        vs = list(range(n))
+        es = [((rng.randrange(n), rng.randrange(n)), rng.randrange(5)) for _ in range(m)]
+        esperado = kruskal(vs, es)
+        for processos, bloco in ((1, 1 << 20), (1, 7), (3, 64)):
+            obtido = boruvka(vs, es, processos, bloco)
+            assert len(obtido) == len(esperado)
+            assert sorted(map(es.index, obtido)) == sorted(map(es.index, esperado))
+
+    print("Todos os testes de Boruvka passaram.")
+
+
+if __name__ == "__main__":
+    _run_tests()
+
+    import time
+    n, m = 10**6, 10**7
+    rng = np.random.default_rng(1)
+    arestas = np.empty(m, dtype=[('u', np.int64), ('v', np.int64), ('w', np.int64)])
+    arestas['u'] = rng.integers(0, n, m)
+    arestas['v'] = rng.integers(0, n, m)
+    arestas['w'] = rng.integers(0, 10**9, m)
+    for processos in (1, os.cpu_count() or 1):
+        inicio = time.time()
+        mst = boruvka_estruturado(arestas, n, processos)
+        print(processos, "processo(s):", len(mst), "arestas,",
+              time.time() - inicio, "segundos")
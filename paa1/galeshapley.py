@@ -3,6 +3,7 @@
 import random
 from collections import deque
 import matplotlib.pyplot as plt
+import numpy as np
 
 def plot_curves(i_rand, i_hard, i_easy):
     # Build aligned x/y arrays
@@ -132,6 +133,79 @@ def gale_shapley(m_prefs: dict[str, list[str]], w_prefs: dict[str, list[str]], v
     # Build result set S of engaged pairs
     return {(m, w) for w, m in engaged_to.items()}, i_loop
 
+def to_arrays(m_prefs: dict[str, list[str]], w_prefs: dict[str, list[str]]):
+    """
+    Map names to integer ids once and store the instance as int32 matrices.
+
+    returns: (men, women, m_pref, m_len, w_rank)
+      men, women: id -> name lists (in the dicts' order)
+      m_pref[m, k]: id of the k-th woman in man m's list (-1 after the end)
+      m_len[m]:     length of man m's list
+      w_rank[w, m]: position of man m in woman w's list (n_men if absent)
+    """
+    men = list(m_prefs.keys())
+    women = list(w_prefs.keys())
+    m_id = {m: i for i, m in enumerate(men)}
+    w_id = {w: i for i, w in enumerate(women)}
+    n_m, n_w = len(men), len(women)
+
+    m_pref = np.full((n_m, n_w), -1, dtype=np.int32)
+    m_len = np.zeros(n_m, dtype=np.int32)
+    for i, m in enumerate(men):
+        m_pref[i, :len(m_prefs[m])] = [w_id[w] for w in m_prefs[m]]
+        m_len[i] = len(m_prefs[m])
+
+    w_rank = np.full((n_w, n_m), n_m, dtype=np.int32)
+    for j, w in enumerate(women):
+        w_rank[j, [m_id[m] for m in w_prefs[w]]] = np.arange(len(w_prefs[w]), dtype=np.int32)
+    return men, women, m_pref, m_len, w_rank
+
+def gale_shapley_arrays(m_pref, m_len, w_rank):
+    """
+    Same proposal sequence as gale_shapley, on integer ids.
+    m_pref, m_len, w_rank: int32 arrays as built by to_arrays
+    returns: (husband, i_loop), husband[w] = id of w's partner or -1
+    """
+    n_m, n_w = m_pref.shape
+    # Flat int32 views: indexing a memoryview yields plain ints, much faster than numpy scalars
+    pref = memoryview(np.ascontiguousarray(m_pref, dtype=np.int32).ravel())
+    rank = memoryview(np.ascontiguousarray(w_rank, dtype=np.int32).ravel())
+    length = m_len.tolist()
+
+    free_men = deque(range(n_m))
+    next_idx = [0] * n_m
+    husband = [-1] * n_w
+
+    i_loop = 0
+    while free_men:
+        i_loop += 1
+        m = free_men.popleft()
+        k = next_idx[m]
+        if k >= length[m]:
+            continue
+        w = pref[m * n_w + k]
+        next_idx[m] = k + 1
+
+        m_prime = husband[w]
+        if m_prime < 0:
+            husband[w] = m
+        elif rank[w * n_m + m_prime] < rank[w * n_m + m]:
+            free_men.append(m)
+        else:
+            husband[w] = m
+            free_men.append(m_prime)
+
+    return np.array(husband, dtype=np.int32), i_loop
+
+def gale_shapley_int(m_prefs: dict[str, list[str]], w_prefs: dict[str, list[str]]):
+    """
+    Integer-array mode of gale_shapley: same stable matching and same i_loop,
+    with n x n int32 matrices instead of a dict of dicts for the ranks.
+    """
+    men, women, m_pref, m_len, w_rank = to_arrays(m_prefs, w_prefs)
+    husband, i_loop = gale_shapley_arrays(m_pref, m_len, w_rank)
+    return {(men[m], women[w]) for w, m in enumerate(husband.tolist()) if m >= 0}, i_loop
+
 def main():
 
     # Demo: https://www.cs.princeton.edu/~wayne/kleinberg-tardos/pdf/01DemoGaleShapley.pdf
@@ -176,6 +250,11 @@ def main():
     # Worst case:
     print(gale_shapley(HOMENS, MULHERES, True))
 
+    # Integer-array mode gives the same matching and the same number of iterations
+    for mp, wm in [(HPL, SPL), (HOMENS, MULHERES), random_instance(300, seed=1),
+                   worstish_instance(200), easy_instance(200)]:
+        assert gale_shapley_int(mp, wm) == gale_shapley(mp, wm)
+
     # Analysis:    
     i_rand = {}
     i_hard = {}
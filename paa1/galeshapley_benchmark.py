@@ -0,0 +1,142 @@
+# Prof. Bruno Iochins Grisci
+"""
+Gale–Shapley scaling experiments on a process pool.
+
+main() in galeshapley.py runs one instance per size, sequentially, up to
+n < 1000. Here every (family, n, seed) run is an independent task: a worker
+process builds the instance, runs the matching and reports
+
+    family, n, seed, engine, proposals (i_loop), generation time,
+    matching time and peak resident memory (MB)
+
+Each task runs in a fresh worker (maxtasksperchild=1), so the peak memory
+of the process is the peak of that run alone. Results are written to CSV
+and/or JSON and can be plotted with plot_curves from galeshapley.py.
+
+The 'int' engine (gale_shapley_arrays on the int32 matrices of
+matching_instances.py) is the default and reaches n = 10^4 and beyond;
+the 'dict' engine runs the original gale_shapley on name dicts and is
+only practical for a few thousand.
+
+Usage:
+    python galeshapley_benchmark.py --sizes 1000 5000 10000 --seeds 3 --csv runs.csv --json runs.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import resource
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from galeshapley import (easy_instance, gale_shapley, gale_shapley_arrays, random_instance,
+                         worstish_instance)
+from matching_instances import BIPARTITE
+
+FAMILIES = ('random', 'worstish', 'easy')
+FIELDS = ('family', 'n', 'seed', 'engine', 'proposals', 'gen_seconds', 'match_seconds', 'peak_mb')
+
+
+DICT_FAMILIES = {'random': random_instance,
+                 'worstish': lambda n, seed: worstish_instance(n),
+                 'easy': lambda n, seed: easy_instance(n)}
+
+
+def _peak_mb():
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return kb / 1024 if sys.platform != 'darwin' else kb / 2**20   # bytes on macOS
+
+
+def run_one(task):
+    """Generate one instance and match it. task = (family, n, seed, engine)."""
+    family, n, seed, engine = task
+    start = time.perf_counter()
+    if engine == 'int':
+        m_pref, w_rank = BIPARTITE[family](n, seed)
+        m_len = np.full(n, n, dtype=np.int32)
+        gen = time.perf_counter() - start
+        start = time.perf_counter()
+        _, proposals = gale_shapley_arrays(m_pref, m_len, w_rank)
+    else:
+        mp, wp = DICT_FAMILIES[family](n, seed)
+        gen = time.perf_counter() - start
+        start = time.perf_counter()
+        _, proposals = gale_shapley(mp, wp)
+    match = time.perf_counter() - start
+    return {'family': family, 'n': n, 'seed': seed, 'engine': engine, 'proposals': proposals,
+            'gen_seconds': round(gen, 6), 'match_seconds': round(match, 6),
+            'peak_mb': round(_peak_mb(), 1)}
+
+
+def run_benchmark(sizes, seeds=3, families=FAMILIES, engine='int', processes=None, verbose=True):
+    """Run every (family, n, seed) on a process pool. Returns the list of result rows."""
+    tasks = [(f, n, s, engine) for n in sizes for f in families
+             for s in range(seeds if f == 'random' else 1)]   # structured families are deterministic
+    rows = []
+    with Pool(processes or os.cpu_count() or 1, maxtasksperchild=1) as pool:
+        for row in pool.imap_unordered(run_one, tasks):
+            rows.append(row)
+            if verbose:
+                print(', '.join(f'{k}={row[k]}' for k in FIELDS), flush=True)
+    rows.sort(key=lambda r: (r['family'], r['n'], r['seed']))
+    return rows
+
+
+def write_csv(rows, path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(rows, path):
+    with open(path, 'w') as f:
+        json.dump(rows, f, indent=1)
+
+
+def mean_proposals(rows, family):
+    """{n: mean proposals over seeds} for one family, in the format of plot_curves."""
+    acc = {}
+    for r in rows:
+        if r['family'] == family:
+            acc.setdefault(r['n'], []).append(r['proposals'])
+    return {n: sum(v) / len(v) for n, v in sorted(acc.items())}
+
+
+def _check():
+    for family in ('worstish', 'easy'):
+        assert run_one((family, 60, 0, 'int'))['proposals'] == run_one((family, 60, 0, 'dict'))['proposals']
+    assert run_one(('worstish', 50, 0, 'int'))['proposals'] == 50 * 51 // 2
+    assert run_one(('easy', 50, 0, 'int'))['proposals'] == 50
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2500, 5000, 10000])
+    parser.add_argument('--seeds', type=int, default=3)
+    parser.add_argument('--families', nargs='+', choices=FAMILIES, default=list(FAMILIES))
+    parser.add_argument('--engine', choices=('int', 'dict'), default='int')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--csv', default='galeshapley_runs.csv')
+    parser.add_argument('--json', default=None)
+    parser.add_argument('--plot', action='store_true')
+    args = parser.parse_args()
+
+    _check()
+    rows = run_benchmark(args.sizes, args.seeds, args.families, args.engine, args.processes)
+    if args.csv:
+        write_csv(rows, args.csv)
+    if args.json:
+        write_json(rows, args.json)
+    if args.plot:
+        from galeshapley import plot_curves
+        plot_curves(mean_proposals(rows, 'random'), mean_proposals(rows, 'worstish'),
+                    mean_proposals(rows, 'easy'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+# Prof. Bruno Iochins Grisci
+"""
+Hospitals/Residents: many-to-one stable matching with capacities.
+
+gale_shapley in galeshapley.py is one-to-one. Here each hospital h accepts
+up to capacity[h] residents, and preference lists may be incomplete: a pair
+(r, h) is acceptable only if each appears in the other's list.
+
+Resident-proposing deferred acceptance:
+  - a free resident applies to the next hospital in their list;
+  - if the hospital does not rank them, they are rejected;
+  - if the hospital has a free seat, it holds the application;
+  - otherwise the hospital compares the applicant with the worst resident it
+    currently holds and keeps the better one.
+
+Each hospital keeps its held residents in a bounded max-heap keyed by its
+rank of them (heapq with negated ranks), so the worst one is at the top and
+replacing it costs O(log c). The result is the resident-optimal stable
+matching. Names are mapped to integer ids once, and ranks are stored per
+hospital only for the residents it lists (memory proportional to the total
+length of the lists).
+"""
+
+import heapq
+import random
+from collections import deque
+
+
+def hospitals_residents(r_prefs: dict[str, list[str]], h_prefs: dict[str, list[str]],
+                        capacity: dict[str, int]):
+    """
+    r_prefs: {resident: [hospitals in descending preference]}
+    h_prefs: {hospital: [residents in descending preference]}
+    capacity: {hospital: number of seats}
+    returns: ({hospital: [assigned residents, best first]}, proposals)
+    """
+    residents = list(r_prefs.keys())
+    hospitals = list(h_prefs.keys())
+    h_id = {h: j for j, h in enumerate(hospitals)}
+    r_id = {r: i for i, r in enumerate(residents)}
+
+    pref = [[h_id[h] for h in r_prefs[r]] for r in residents]
+    rank = [{r_id[r]: k for k, r in enumerate(h_prefs[h])} for h in hospitals]
+    cap = [capacity[h] for h in hospitals]
+
+    held = [[] for _ in hospitals]       # per hospital: max-heap of (-rank, resident)
+    next_idx = [0] * len(residents)
+    free = deque(range(len(residents)))
+
+    proposals = 0
+    while free:
+        r = free.popleft()
+        if next_idx[r] >= len(pref[r]):
+            continue                     # r has applied everywhere: stays unmatched
+        h = pref[r][next_idx[r]]
+        next_idx[r] += 1
+        proposals += 1
+
+        k = rank[h].get(r)
+        if k is None or cap[h] == 0:
+            free.append(r)               # unacceptable to h
+        elif len(held[h]) < cap[h]:
+            heapq.heappush(held[h], (-k, r))
+        elif -held[h][0][0] > k:
+            _, worst = heapq.heapreplace(held[h], (-k, r))
+            free.append(worst)           # h's worst resident is bumped
+        else:
+            free.append(r)
+
+    assignment = {}
+    for j, h in enumerate(hospitals):
+        assignment[h] = [residents[r] for _, r in sorted(held[j], reverse=True)]
+    return assignment, proposals
+
+
+def is_stable(r_prefs, h_prefs, capacity, assignment):
+    """
+    Check capacities, acceptability and the absence of blocking pairs: (r, h)
+    blocks if both list each other, r prefers h to their hospital (or is
+    unmatched), and h has a free seat or prefers r to one of its residents.
+    """
+    where = {}
+    for h, rs in assignment.items():
+        if len(rs) > capacity[h]:
+            return False
+        for r in rs:
+            if r in where or h not in r_prefs[r] or r not in h_prefs[h]:
+                return False
+            where[r] = h
+
+    h_rank = {h: {r: k for k, r in enumerate(lst)} for h, lst in h_prefs.items()}
+    for r, lst in r_prefs.items():
+        for h in lst:
+            if where.get(r) == h:
+                break                    # hospitals after this one are worse for r
+            if r not in h_rank[h]:
+                continue
+            rs = assignment[h]
+            if len(rs) < capacity[h]:
+                return False
+            if any(h_rank[h][r] < h_rank[h][x] for x in rs):
+                return False
+    return True
+
+
+def random_instance(n_residents, n_hospitals, list_length, seats, seed=None):
+    """
+    Random incomplete instance: each resident lists list_length hospitals,
+    each hospital ranks (in random order) every resident that listed it.
+    """
+    rng = random.Random(seed)
+    hospitals = [f"H{j}" for j in range(1, n_hospitals + 1)]
+    r_prefs = {f"R{i}": rng.sample(hospitals, k=min(list_length, n_hospitals))
+               for i in range(1, n_residents + 1)}
+    applicants = {h: [] for h in hospitals}
+    for r, lst in r_prefs.items():
+        for h in lst:
+            applicants[h].append(r)
+    h_prefs = {}
+    for h in hospitals:
+        rng.shuffle(applicants[h])
+        h_prefs[h] = applicants[h]
+    capacity = {h: rng.randint(1, seats) for h in hospitals}
+    return r_prefs, h_prefs, capacity
+
+
+def run_reference_tests():
+    from galeshapley import gale_shapley
+
+    # Capacity 1 everywhere: the resident-optimal one-to-one stable matching
+    HPL = {
+        'Atlanta': ['Wayne',  'Val',     'Yolanda', 'Zeus',   'Xavier'],
+        'Boston':  ['Yolanda','Wayne',   'Val',     'Xavier', 'Zeus'],
+        'Chicago': ['Wayne',  'Zeus',    'Xavier',  'Yolanda','Val'],
+        'Detroit': ['Val',    'Yolanda', 'Xavier',  'Wayne',  'Zeus'],
+        'El Paso': ['Wayne',  'Yolanda', 'Val',     'Zeus',   'Xavier'],
+    }
+    SPL = {
+        'Val':     ['El Paso', 'Atlanta', 'Boston',  'Detroit', 'Chicago'],
+        'Wayne':   ['Chicago', 'Boston',  'Detroit', 'Atlanta', 'El Paso'],
+        'Xavier':  ['Boston',  'Chicago', 'Detroit', 'El Paso', 'Atlanta'],
+        'Yolanda': ['Atlanta', 'El Paso', 'Detroit', 'Chicago', 'Boston'],
+        'Zeus':    ['Detroit', 'Boston',  'El Paso', 'Chicago', 'Atlanta'],
+    }
+    assignment, _ = hospitals_residents(SPL, HPL, {h: 1 for h in HPL})
+    pairs, _ = gale_shapley(SPL, HPL)
+    assert {(rs[0], h) for h, rs in assignment.items()} == pairs
+
+    # Small hand-made instance with capacities and incomplete lists
+    r_prefs = {'a': ['X', 'Y'], 'b': ['X'], 'c': ['X', 'Y'], 'd': ['Y'], 'e': ['Z']}
+    h_prefs = {'X': ['c', 'a', 'b'], 'Y': ['a', 'd', 'c'], 'Z': []}
+    capacity = {'X': 2, 'Y': 1, 'Z': 3}
+    assignment, _ = hospitals_residents(r_prefs, h_prefs, capacity)
+    assert assignment == {'X': ['c', 'a'], 'Y': ['d'], 'Z': []}
+    assert is_stable(r_prefs, h_prefs, capacity, assignment)
+
+    for seed in range(200):
+        inst = random_instance(12, 4, 3, 3, seed)
+        assignment, _ = hospitals_residents(*inst)
+        assert is_stable(*inst, assignment)
+
+    print("All hospitals/residents reference tests passed.")
+
+
+if __name__ == '__main__':
+    import time
+
+    run_reference_tests()
+
+    inst = random_instance(10**5, 2000, 10, 60, seed=0)
+    start = time.perf_counter()
+    assignment, proposals = hospitals_residents(*inst)
+    elapsed = time.perf_counter() - start
+    matched = sum(len(rs) for rs in assignment.values())
+    print(f"10^5 residents, 2000 hospitals: {matched} matched, {proposals} proposals, {elapsed:.2f} s")
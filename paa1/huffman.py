@@ -2,38 +2,6 @@
 
 import heapq
 
-# Le o arquivo de texto "alice.txt" contendo o livro "Alice no País das Maravilhas" (original em inglês)
-# O arquivo precisa estar na mesma pasta do script, ou o caminho dele alterado no comando abaixo
-with open("alice.txt", mode="r", encoding="utf-8") as f:
-	data = f.read()
-	
-# dicionário/histograma de letras	
-hist = {}	
-out  = []
-
-# processa a string de entrada, gerando uma lista de caracteres e convertendo símbolos UNICODE para símbolos correspondentes ASCII (0-127)
-for i in range(len(data)):
-	s = data[i]
-	if (s=='”'):
-		out.append('"')
-	elif (s=='“'):
-		out.append('"')
-	elif (s=='—'):
-		out.append('-')
-	elif (s=='’'):
-		out.append('\'')
-	else:
-		out.append(s)
-
-
-# gera histograma da lista de caracteres ASCII obtida
-for s in out:
-	try:
-		hist[s] += 1
-	except KeyError:
-		hist[s] = 1
-
-
 '''
 
 Descrição da estrutura de dados (baseada em pares ordenados aninhados)
@@ -62,6 +30,107 @@ def huffman(p):
 	return (F[0])[1]
 	
 
+# Huffman em tempo linear com duas filas (frequências já ordenadas)
+# Fila 1: folhas em ordem crescente de peso. Fila 2: árvores criadas pelas junções,
+# que já nascem em ordem crescente de peso (cada junção pesa pelo menos a anterior).
+# Assim as duas menores árvores estão sempre no início das filas: não há heap, nem
+# comparação entre árvores em caso de empate (no empate, a folha é escolhida).
+# Se p não estiver ordenado, as letras são ordenadas antes (O(n log n)).
+def huffman_duas_filas(p):
+
+	folhas = sorted(p.keys(), key=lambda s: p[s])   # O(n) se já estiver ordenado (Timsort)
+	pf = [p[s] for s in folhas]                     # pesos das folhas
+	arv = []                                        # árvores das junções (fila 2)
+	pa  = []                                        # pesos das junções
+	i = 0                                           # início da fila 1
+	j = 0                                           # início da fila 2
+
+	def extrai_menor():
+		nonlocal i, j
+		if j >= len(arv) or (i < len(folhas) and pf[i] <= pa[j]):
+			i += 1
+			return pf[i-1], ('leaf', folhas[i-1])
+		j += 1
+		return pa[j-1], arv[j-1]
+
+	for _ in range(len(folhas)-1):                  # n-1 junções
+		(w1,a1) = extrai_menor()
+		(w2,a2) = extrai_menor()
+		arv.append(('node', a1, a2))
+		pa.append(w1+w2)
+
+	if arv:
+		return arv[-1]
+	return ('leaf', folhas[0])
+
+
+# Comprimentos de código de Huffman no próprio vetor (Moffat e Katajainen, 1995)
+# Entrada: lista A de inteiros em ordem crescente (frequências das letras).
+# Saída: a mesma lista, com A[i] = comprimento do código da i-ésima letra.
+# Tempo O(n) e nenhuma memória extra: o vetor guarda, em fases, os pesos das
+# junções, depois os índices dos pais, depois as profundidades.
+def moffat_katajainen(A):
+	n = len(A)
+	if n == 0:
+		return A
+	if n == 1:
+		A[0] = 0
+		return A
+
+	# fase 1: junções (A[0..prox-1] passam a guardar pesos e depois índices de pais)
+	A[0] += A[1]
+	raiz = 0                                        # próxima junção ainda não usada
+	folha = 2                                       # próxima folha ainda não usada
+	for prox in range(1, n-1):
+		# primeiro filho
+		if folha >= n or A[raiz] < A[folha]:
+			A[prox] = A[raiz]
+			A[raiz] = prox                          # raiz agora aponta para o pai
+			raiz += 1
+		else:
+			A[prox] = A[folha]
+			folha += 1
+		# segundo filho
+		if folha >= n or (raiz < prox and A[raiz] < A[folha]):
+			A[prox] += A[raiz]
+			A[raiz] = prox
+			raiz += 1
+		else:
+			A[prox] += A[folha]
+			folha += 1
+
+	# fase 2: profundidade de cada junção (da raiz, em n-2, para baixo)
+	A[n-2] = 0
+	for prox in range(n-3, -1, -1):
+		A[prox] = A[A[prox]] + 1
+
+	# fase 3: profundidade das folhas, nível a nível
+	disponiveis = 1                                 # nodos no nível atual
+	usados = 0                                      # junções no nível atual
+	profundidade = 0
+	raiz = n-2
+	prox = n-1
+	while disponiveis > 0:
+		while raiz >= 0 and A[raiz] == profundidade:
+			usados += 1
+			raiz -= 1
+		while disponiveis > usados:                 # os demais nodos do nível são folhas
+			A[prox] = profundidade
+			prox -= 1
+			disponiveis -= 1
+		disponiveis = 2*usados
+		profundidade += 1
+		usados = 0
+	return A
+
+
+# Comprimentos {letra: comprimento} via moffat_katajainen sobre um vetor de inteiros
+def comprimentos_huffman(p):
+	letras = sorted(p.keys(), key=lambda s: p[s])
+	A = moffat_katajainen([p[s] for s in letras])
+	return {letras[i]: A[i] for i in range(len(letras))}
+
+
 # Conversão da árvore no código correspondente
 def tree2code(t):
 	c = {}
@@ -77,28 +146,193 @@ def tree2code(t):
 		return( mc1 | mc2 )                     # devolve a união de dicionários mc1 e mc2
 
 
+# Conversão iterativa da árvore no código correspondente
+# Em vez de strings, devolve para cada letra o par (código, comprimento), onde
+# código é um inteiro cujos 'comprimento' bits (do mais significativo ao menos
+# significativo) formam o caminho da raiz até a folha ('0' = esquerda).
+# Usa uma pilha explícita: não há limite de recursão e cada nodo é visitado uma
+# única vez, sem recopiar dicionários e strings a cada nível (O(n) no total).
+def tree2code_iterativo(t):
+	c = {}
+	pilha = [(t, 0, 0)]                         # (subárvore, código até ela, profundidade)
+	while pilha:
+		(a, codigo, n) = pilha.pop()
+		if (a[0]=='leaf'):
+			c[a[1]] = (codigo, n)
+		else:
+			pilha.append((a[2], (codigo<<1)|1, n+1))  # direita: acrescenta bit 1
+			pilha.append((a[1], codigo<<1, n+1))      # esquerda: acrescenta bit 0
+	return c
+
+
+# Código canônico a partir dos comprimentos {letra: comprimento}
+# Letras ordenadas por (comprimento, letra) recebem códigos consecutivos; ao
+# passar para um comprimento maior, o código é deslocado para a esquerda.
+# Devolve {letra: (código, comprimento)}, no mesmo formato de tree2code_iterativo.
+def codigo_canonico(comp):
+	c = {}
+	codigo = 0
+	anterior = 0
+	for s in sorted(comp, key=lambda s: (comp[s], s)):
+		codigo <<= comp[s] - anterior
+		c[s] = (codigo, comp[s])
+		codigo += 1
+		anterior = comp[s]
+	return c
+
+
+# Comprimentos de código limitados a L bits (algoritmo package-merge, Larmore e Hirschberg)
+# Cada letra é uma "moeda" de largura 2^-l para cada nível l = 1..L. Em cada nível,
+# as moedas são agrupadas duas a duas em pacotes, que são intercalados (por peso)
+# com as moedas do nível anterior. Os 2n-2 itens mais leves da lista final formam a
+# solução ótima: o comprimento do código de cada letra é o número de vezes que ela
+# aparece nesses itens. Custo O(nL) após a ordenação.
+def comprimentos_limitados(p, L):
+	letras = sorted(p.keys(), key=lambda s: p[s])
+	n = len(letras)
+	if n == 0:
+		return {}
+	if n == 1:
+		return {letras[0]: 1}                    # uma única letra ainda precisa de 1 bit
+	if (1 << L) < n:
+		raise ValueError(f"Impossível codificar {n} letras com no máximo {L} bits.")
+
+	moedas = [(p[s], 0, i) for i, s in enumerate(letras)]   # item = (peso, 0, letra) ou (peso, 1, (item, item))
+	lista = moedas
+	for _ in range(L - 1):
+		pacotes = [(lista[i][0]+lista[i+1][0], 1, (lista[i], lista[i+1])) for i in range(0, len(lista)-1, 2)]
+		lista = list(heapq.merge(moedas, pacotes, key=lambda x: (x[0], x[1])))  # no empate, moedas primeiro
+
+	# conta as ocorrências de cada letra nos 2n-2 primeiros itens (pilha explícita)
+	comp = [0] * n
+	pilha = lista[:2*n-2]
+	while pilha:
+		(_, tipo, x) = pilha.pop()
+		if tipo == 0:
+			comp[x] += 1
+		else:
+			pilha.append(x[0])
+			pilha.append(x[1])
+	return {letras[i]: comp[i] for i in range(n)}
+
+
+# Código de Huffman com comprimento máximo L: {letra: (código, comprimento)}
+def huffman_limitado(p, L):
+	return codigo_canonico(comprimentos_limitados(p, L))
+
+
 
 ####################################################
 
-# Distribuições para teste
-h1 = { 'A':60, 'B':25, 'C':10, 'D':5 }
-h2 = { 'A':3, 'B':2, 'C':6, 'D':8, 'E':2, 'F':6 }
+if __name__ == "__main__":
 
+	# Le o arquivo de texto "alice.txt" contendo o livro "Alice no País das Maravilhas" (original em inglês)
+	# O arquivo precisa estar na mesma pasta do script, ou o caminho dele alterado no comando abaixo
+	with open("alice.txt", mode="r", encoding="utf-8") as f:
+		data = f.read()
 
-# Constroi a codificação da Huffman com base na frequência de caracteres do texto original em inglês de "Alice no País das Maravilhas"
+	# dicionário/histograma de letras	
+	hist = {}	
+	out  = []
 
-aliceCode = tree2code(huffman(hist))
+	# processa a string de entrada, gerando uma lista de caracteres e convertendo símbolos UNICODE para símbolos correspondentes ASCII (0-127)
+	for i in range(len(data)):
+		s = data[i]
+		if (s=='”'):
+			out.append('"')
+		elif (s=='“'):
+			out.append('"')
+		elif (s=='—'):
+			out.append('-')
+		elif (s=='’'):
+			out.append('\'')
+		else:
+			out.append(s)
 
-# Contagem do tamanho (em bits) necessário para a codificação e o texto original
-acc1 = 0
-acc2 = 0
-for s in out:
-	acc1 += len(aliceCode[s])
-	acc2 += 8
-	
-# Impressão do código gerado
-print(tree2code(huffman(hist)))
 
-# Tamanho do texto original e da versão comprimida (em bytes)
-print("Tamanho do texto codificado: ", acc1/8)
-print("Tamaho do texto em ASCII: ", acc2/8)
+	# gera histograma da lista de caracteres ASCII obtida
+	for s in out:
+		try:
+			hist[s] += 1
+		except KeyError:
+			hist[s] = 1
+
+	# Distribuições para teste
+	h1 = { 'A':60, 'B':25, 'C':10, 'D':5 }
+	h2 = { 'A':3, 'B':2, 'C':6, 'D':8, 'E':2, 'F':6 }
+
+
+	# Constroi a codificação da Huffman com base na frequência de caracteres do texto original em inglês de "Alice no País das Maravilhas"
+
+	aliceCode = tree2code(huffman(hist))
+
+	# Contagem do tamanho (em bits) necessário para a codificação e o texto original
+	acc1 = 0
+	acc2 = 0
+	for s in out:
+		acc1 += len(aliceCode[s])
+		acc2 += 8
+
+	# Impressão do código gerado
+	print(tree2code(huffman(hist)))
+
+	# Mesmo código como pares (código inteiro, comprimento), e uma versão limitada a 10 bits
+	print(tree2code_iterativo(huffman(hist)))
+	print(max(n for (_, n) in tree2code_iterativo(huffman(hist)).values()), "bits no código mais longo")
+	print(max(n for (_, n) in huffman_limitado(hist, 10).values()), "bits no código mais longo (limitado)")
+
+	# Construções lineares: duas filas (árvore) e Moffat-Katajainen (apenas comprimentos)
+	print(tree2code(huffman_duas_filas(h2)))
+	print(comprimentos_huffman(h2))
+
+	# As construções lineares dão o mesmo custo total (soma de peso x comprimento)
+	# que o Huffman com heap: distribuições aleatórias, com empates, 1 e 2 letras
+	import random
+	def custo(p, comp):
+		return sum(p[s] * comp[s] for s in p)
+	rng = random.Random(0)
+	testes = [{'A': 7}, {'A': 3, 'B': 9}, {'A': 4, 'B': 4}, h1, h2, hist]
+	for _ in range(300):
+		n = rng.randint(1, 40)
+		testes.append({i: rng.randint(1, rng.choice([3, 1000])) for i in range(n)})
+	for p in testes:
+		otimo = custo(p, {s: len(c) for s, c in tree2code(huffman(p)).items()})
+		assert custo(p, {s: len(c) for s, c in tree2code(huffman_duas_filas(p)).items()}) == otimo
+		assert custo(p, comprimentos_huffman(p)) == otimo
+		A = sorted(p.values())
+		assert sum(a * l for a, l in zip(A, moffat_katajainen(A.copy()))) == otimo
+
+	# Package-merge: desigualdade de Kraft, limite L, ótimo por força bruta
+	# (n <= 6) e o mesmo código de Huffman quando o limite não restringe
+	import itertools
+	from fractions import Fraction
+	def forca_bruta(p, L):
+		letras = list(p)
+		melhor = None
+		for comp in itertools.product(range(1, L + 1), repeat=len(letras)):
+			if sum(1 << (L - l) for l in comp) <= 1 << L:       # Kraft em inteiros
+				c = sum(p[s] * l for s, l in zip(letras, comp))
+				melhor = c if melhor is None else min(melhor, c)
+		return melhor
+	for _ in range(100):
+		n = rng.randint(2, 6)
+		p = {i: rng.randint(1, rng.choice([3, 1000])) for i in range(n)}
+		for L in range((n - 1).bit_length(), n + 1):
+			comp = comprimentos_limitados(p, L)
+			assert sum(Fraction(1, 2**l) for l in comp.values()) <= 1
+			assert max(comp.values()) <= L
+			assert custo(p, comp) == forca_bruta(p, min(L, n - 1))
+	assert comprimentos_limitados({'A': 7}, 3) == {'A': 1}
+	for p in testes:
+		n = len(p)
+		if n < 2:
+			continue                             # uma letra: 1 bit no package-merge, 0 na árvore
+		for L in (n - 1, n + 3):
+			assert comprimentos_limitados(p, L) == {s: len(c) for s, c in tree2code(huffman(p)).items()}
+	for L in (9, 10, 12):
+		comp = {s: n for s, (_, n) in huffman_limitado(hist, L).items()}
+		assert max(comp.values()) <= L and sum(Fraction(1, 2**l) for l in comp.values()) <= 1
+
+	# Tamanho do texto original e da versão comprimida (em bytes)
+	print("Tamanho do texto codificado: ", acc1/8)
+	print("Tamaho do texto em ASCII: ", acc2/8)
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Codigo de Huffman adaptativo (algoritmo FGK: Faller, Gallager e Knuth).
+
+`huffman.py` e `huffman_codec.py` precisam de uma passada completa pelos
+dados para construir o histograma antes de emitir qualquer bit. No Huffman
+adaptativo, codificador e decodificador comecam com a mesma arvore vazia e a
+atualizam, de forma identica, a cada simbolo processado. Nao ha histograma
+previo, nem tabela no cabecalho: a saida pode ser emitida enquanto os dados
+chegam (logs, fluxos de rede).
+
+A arvore mantem a propriedade dos irmaos: os nodos, numerados de baixo para
+cima, tem pesos nao decrescentes, e irmaos tem numeros consecutivos. Ao
+incrementar o peso de um nodo, ele e antes trocado com o lider do seu bloco
+(o nodo de maior numero com o mesmo peso), o que preserva a propriedade.
+
+Simbolos ainda nao vistos sao enviados como o codigo da folha especial NYT
+("not yet transmitted") seguido de 9 bits com o valor do simbolo. O alfabeto
+tem os 256 bytes e dois simbolos de controle:
+
+- FIM: fim do fluxo;
+- ALINHA: completa o byte atual com zeros. Permite ao codificador entregar
+  tudo o que recebeu ate o momento (latencia limitada), sem encerrar o fluxo.
+"""
+
+import io
+
+
+FIM = 256
+ALINHA = 257
+ALFABETO = 258
+BITS_BRUTOS = 9
+
+
+class ArvoreFGK:
+
+    def __init__(self, alfabeto=ALFABETO):
+        m = 2 * alfabeto + 1               # maximo de nodos (folhas, NYT e internos)
+        # nodos em vetores paralelos; o nodo 0 e a raiz (inicialmente NYT)
+        self.peso = [0]
+        self.pai = [-1]
+        self.esq = [-1]
+        self.dir = [-1]
+        self.simbolo = [-1]
+        self.numero = [m - 1]              # numero (ordem) de cada nodo
+        self.ordem = [None] * m            # ordem[k] = nodo de numero k
+        self.ordem[m - 1] = 0
+        self.raiz = 0
+        self.nyt = 0
+        self.folha = {}                    # simbolo -> nodo folha
+
+    def _novo(self, numero, simbolo, pai):
+        no = len(self.peso)
+        self.peso.append(0)
+        self.pai.append(pai)
+        self.esq.append(-1)
+        self.dir.append(-1)
+        self.simbolo.append(simbolo)
+        self.numero.append(numero)
+        self.ordem[numero] = no
+        return no
+
+    def eh_folha(self, no):
+        return self.esq[no] == -1
+
+    def codigo(self, no):
+        """Caminho da raiz ate o nodo: (codigo inteiro, numero de bits)."""
+        codigo = 0
+        n = 0
+        while no != self.raiz:
+            p = self.pai[no]
+            if self.dir[p] == no:
+                codigo |= 1 << n
+            n += 1
+            no = p
+        return codigo, n
+
+    def _lider(self, no):
+        # nodo de maior numero com o mesmo peso (os pesos crescem com o numero)
+        k = self.numero[no]
+        w = self.peso[no]
+        ordem, peso = self.ordem, self.peso
+        while k + 1 < len(ordem) and peso[ordem[k + 1]] == w:
+            k += 1
+        return ordem[k]
+
+    def _troca(self, a, b):
+        # troca as subarvores a e b de lugar (nenhuma e ancestral da outra)
+        pa, pb = self.pai[a], self.pai[b]
+        if pa == pb:
+            self.esq[pa], self.dir[pa] = self.dir[pa], self.esq[pa]
+        else:
+            if self.esq[pa] == a:
+                self.esq[pa] = b
+            else:
+                self.dir[pa] = b
+            if self.esq[pb] == b:
+                self.esq[pb] = a
+            else:
+                self.dir[pb] = a
+            self.pai[a], self.pai[b] = pb, pa
+        na, nb = self.numero[a], self.numero[b]
+        self.numero[a], self.numero[b] = nb, na
+        self.ordem[na], self.ordem[nb] = b, a
+
+    def atualiza(self, s):
+        """Inclui uma ocorrencia do simbolo s, mantendo a propriedade dos irmaos."""
+        if s in self.folha:
+            q = self.folha[s]
+        else:
+            # NYT vira nodo interno com filhos NYT (esquerda) e folha de s (direita)
+            velho = self.nyt
+            k = self.numero[velho]
+            self.nyt = self._novo(k - 2, -1, velho)
+            q = self._novo(k - 1, s, velho)
+            self.esq[velho] = self.nyt
+            self.dir[velho] = q
+            self.folha[s] = q
+        while q != -1:
+            lider = self._lider(q)
+            if lider != q and lider != self.pai[q]:
+                self._troca(q, lider)
+            self.peso[q] += 1
+            q = self.pai[q]
+
+
+class CodificadorAdaptativo:
+    """
+    Codificador incremental: cada chamada devolve os bytes ja completos.
+
+        c = CodificadorAdaptativo()
+        saida = c.codifica(b'parte 1') + c.alinha() + c.codifica(b'parte 2') + c.termina()
+    """
+
+    def __init__(self):
+        self.arvore = ArvoreFGK()
+        self.acc = 0             # bits pendentes (menos de 8 entre chamadas)
+        self.nbits = 0
+        self.simbolos = 0        # bytes de entrada ja codificados
+
+    def _emite(self, codigo, n, saida):
+        self.acc = (self.acc << n) | codigo
+        self.nbits += n
+        while self.nbits >= 8:
+            self.nbits -= 8
+            saida.append((self.acc >> self.nbits) & 0xFF)
+        self.acc &= (1 << self.nbits) - 1
+
+    def _simbolo(self, s, saida):
+        t = self.arvore
+        if s in t.folha:
+            self._emite(*t.codigo(t.folha[s]), saida)
+        else:
+            self._emite(*t.codigo(t.nyt), saida)
+            self._emite(s, BITS_BRUTOS, saida)
+        t.atualiza(s)
+
+    def codifica(self, dados):
+        saida = bytearray()
+        for s in dados:
+            self._simbolo(s, saida)
+        self.simbolos += len(dados)
+        return bytes(saida)
+
+    def alinha(self):
+        """Emite ALINHA e completa o byte: tudo o que foi codificado pode ser decodificado."""
+        saida = bytearray()
+        self._simbolo(ALINHA, saida)
+        if self.nbits:
+            self._emite(0, 8 - self.nbits, saida)
+        return bytes(saida)
+
+    def termina(self):
+        """Emite FIM e completa o ultimo byte."""
+        saida = bytearray()
+        self._simbolo(FIM, saida)
+        if self.nbits:
+            self._emite(0, 8 - self.nbits, saida)
+        return bytes(saida)
+
+
+class DecodificadorAdaptativo:
+    """Decodificador incremental: aceita os bytes em qualquer particao."""
+
+    def __init__(self):
+        self.arvore = ArvoreFGK()
+        self.no = self.arvore.raiz
+        self.bruto = None        # bits brutos lidos apos NYT (None = percorrendo a arvore)
+        self.nbruto = 0
+        self.terminou = False
+
+    def decodifica(self, dados):
+        t = self.arvore
+        saida = bytearray()
+        for byte in dados:
+            if self.terminou:
+                break
+            for i in range(7, -1, -1):
+                if self.bruto is None and self.no == t.nyt:
+                    self.bruto = 0         # arvore vazia ou folha NYT: vem um simbolo novo
+                    self.nbruto = 0
+                bit = (byte >> i) & 1
+                if self.bruto is not None:
+                    self.bruto = (self.bruto << 1) | bit
+                    self.nbruto += 1
+                    if self.nbruto < BITS_BRUTOS:
+                        continue
+                    s = self.bruto
+                    self.bruto = None
+                else:
+                    self.no = t.dir[self.no] if bit else t.esq[self.no]
+                    if not t.eh_folha(self.no) or self.no == t.nyt:
+                        continue
+                    s = t.simbolo[self.no]
+
+                if s >= ALFABETO:
+                    raise ValueError("Simbolo invalido no fluxo adaptativo.")
+                t.atualiza(s)
+                self.no = t.raiz
+                if s == FIM:
+                    self.terminou = True
+                    break
+                if s == ALINHA:
+                    break              # descarta o enchimento do byte atual
+                saida.append(s)
+        return bytes(saida)
+
+
+def comprime_adaptativo(dados):
+    c = CodificadorAdaptativo()
+    return c.codifica(dados) + c.termina()
+
+
+def descomprime_adaptativo(dados):
+    d = DecodificadorAdaptativo()
+    saida = d.decodifica(dados)
+    if not d.terminou:
+        raise ValueError("Fluxo adaptativo truncado.")
+    return saida
+
+
+def codifica_fluxo(fin, fout, tamanho_bloco=1 << 16, alinha_a_cada_bloco=False):
+    """
+    Uma unica passada: le fin em blocos e grava a saida de cada bloco em
+    fout imediatamente. Com alinha_a_cada_bloco, cada bloco gravado pode ser
+    decodificado sem esperar pelo seguinte.
+    """
+    c = CodificadorAdaptativo()
+    while True:
+        bloco = fin.read(tamanho_bloco)
+        if not bloco:
+            break
+        fout.write(c.codifica(bloco))
+        if alinha_a_cada_bloco:
+            fout.write(c.alinha())
+        fout.flush()
+    fout.write(c.termina())
+
+
+def decodifica_fluxo(fin, fout, tamanho_bloco=1 << 16):
+    d = DecodificadorAdaptativo()
+    while not d.terminou:
+        bloco = fin.read(tamanho_bloco)
+        if not bloco:
+            raise ValueError("Fluxo adaptativo truncado.")
+        fout.write(d.decodifica(bloco))
+
+
+def compara(dados):
+    """Tamanhos e taxas de compressao: adaptativo (1 passada) x estatico (2 passadas)."""
+    from huffman_codec import comprime
+
+    adaptativo = len(comprime_adaptativo(dados))
+    estatico = len(comprime(dados))
+    print(f"original:   {len(dados):10d} bytes")
+    print(f"adaptativo: {adaptativo:10d} bytes (taxa {adaptativo / max(len(dados), 1):.4f})")
+    print(f"estatico:   {estatico:10d} bytes (taxa {estatico / max(len(dados), 1):.4f}, com cabecalho de 268 bytes)")
+    return adaptativo, estatico
+
+
+def _run_tests():
+    import random
+
+    rng = random.Random(0)
+    casos = [b'', b'a', b'aaaa', b'abracadabra', bytes(range(256)) * 3,
+             bytes(rng.choice(b'aaaaaabbbcd\n') for _ in range(5000))]
+    for dados in casos:
+        z = comprime_adaptativo(dados)
+        assert descomprime_adaptativo(z) == dados
+
+        # entrega incremental: decodificador recebe um byte por vez
+        d = DecodificadorAdaptativo()
+        assert b''.join(d.decodifica(z[i:i + 1]) for i in range(len(z))) == dados
+
+        # latencia limitada: apos alinha(), tudo o que foi enviado ja e decodificavel
+        c = CodificadorAdaptativo()
+        d = DecodificadorAdaptativo()
+        recebido = b''
+        for i in range(0, len(dados), 97):
+            parte = dados[i:i + 97]
+            recebido += d.decodifica(c.codifica(parte) + c.alinha())
+            assert recebido == dados[:i + 97]
+        d.decodifica(c.termina())
+        assert d.terminou
+
+    fin, fz, fout = io.BytesIO(casos[-1]), io.BytesIO(), io.BytesIO()
+    codifica_fluxo(fin, fz, 100, True)
+    decodifica_fluxo(io.BytesIO(fz.getvalue()), fout, 7)
+    assert fout.getvalue() == casos[-1]
+
+    try:
+        descomprime_adaptativo(comprime_adaptativo(b'abracadabra')[:-2])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Fluxo truncado deve ser rejeitado.")
+
+    print("Todos os testes do Huffman adaptativo passaram.")
+
+
+if __name__ == "__main__":
+    _run_tests()
+
+    with open("alice.txt", 'rb') as f:
+        compara(f.read())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Compressao de Huffman em blocos, em paralelo.
+
+`huffman_codec.py` comprime o arquivo inteiro como um unico fluxo de bits,
+em um unico processo. Aqui o arquivo e dividido em blocos de tamanho fixo,
+codificados de forma independente por um conjunto de processos
+(`multiprocessing.Pool`):
+
+1. Histograma global: cada processo conta os bytes de alguns blocos
+   (`np.bincount`) e os contadores sao somados.
+2. Codificacao: cada bloco e codificado separadamente, com o codigo canonico
+   global (modo 'global') ou com um codigo proprio, calculado a partir do
+   histograma do bloco (modo 'bloco', melhor para dados heterogeneos).
+3. Indice: para cada bloco gravamos sua posicao no arquivo comprimido, seu
+   tamanho comprimido e seu tamanho original.
+
+Como cada bloco comeca em um byte conhecido e tem seu proprio numero de
+simbolos, a descompressao tambem pode ser feita em paralelo e qualquer
+bloco pode ser lido isoladamente (acesso aleatorio, `le_bloco`).
+
+Formato do arquivo:
+
+    'HUFB' | modo (1 byte: 0 = global, 1 = bloco) | tamanho do bloco (8 bytes)
+           | comprimentos globais (256 bytes, apenas no modo global)
+           | dados dos blocos (no modo bloco, cada um comeca com 256 bytes de
+             comprimentos)
+           | indice: numero de blocos (8 bytes) e, por bloco,
+             posicao, tamanho comprimido e tamanho original (8 bytes cada)
+           | posicao do indice (8 bytes)
+"""
+
+import io
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from huffman_codec import Empacotador, codigos_canonicos, comprimentos
+from huffman_tabela import DecodificadorTabela
+
+
+MAGICO = b'HUFB'
+TAMANHO_BLOCO = 1 << 22
+MODOS = {'global': 0, 'bloco': 1}
+
+
+def _le_trecho(caminho, posicao, tamanho):
+    with open(caminho, 'rb') as f:
+        f.seek(posicao)
+        return f.read(tamanho)
+
+
+def _conta(tarefa):
+    caminho, posicao, tamanho = tarefa
+    dados = _le_trecho(caminho, posicao, tamanho)
+    return np.bincount(np.frombuffer(dados, dtype=np.uint8), minlength=256)
+
+
+def _comprimentos_bytes(comp):
+    return bytes(comp.get(s, 0) for s in range(256))
+
+
+def _codifica_bloco(tarefa):
+    """Codifica um bloco; devolve (bytes comprimidos, tamanho original)."""
+    caminho, posicao, tamanho, comp = tarefa
+    dados = _le_trecho(caminho, posicao, tamanho)
+    fout = io.BytesIO()
+    if comp is None:
+        # modo bloco: codigo proprio, gravado no inicio do bloco
+        hist = np.bincount(np.frombuffer(dados, dtype=np.uint8), minlength=256)
+        comp = comprimentos({s: int(c) for s, c in enumerate(hist) if c > 0})
+        fout.write(_comprimentos_bytes(comp))
+    emp = Empacotador(fout, codigos_canonicos(comp))
+    emp.adiciona(dados)
+    emp.termina()
+    return fout.getvalue(), len(dados)
+
+
+def _decodifica_bloco(tarefa):
+    caminho, posicao, tamanho, original, comp = tarefa
+    fin = io.BytesIO(_le_trecho(caminho, posicao, tamanho))
+    if comp is None:
+        tabela = fin.read(256)
+        comp = {s: c for s, c in enumerate(tabela) if c > 0}
+    fout = io.BytesIO()
+    DecodificadorTabela(comp).decodifica(fin, fout, original)
+    return fout.getvalue()
+
+
+def _executa(processos, funcao, tarefas):
+    """Aplica funcao as tarefas, em ordem, com ou sem pool de processos."""
+    if processos == 1:
+        yield from map(funcao, tarefas)
+        return
+    with Pool(processos) as pool:
+        yield from pool.imap(funcao, tarefas)
+
+
+def comprime_arquivo(entrada, saida, modo='global', tamanho_bloco=TAMANHO_BLOCO, processos=None):
+    """
+    Comprime `entrada` em `saida` no formato HUFB.
+    Devolve (bytes originais, bytes gravados, numero de blocos).
+    """
+    if modo not in MODOS:
+        raise ValueError("modo deve ser 'global' ou 'bloco'.")
+    if processos is None:
+        processos = os.cpu_count() or 1
+
+    tamanho = os.path.getsize(entrada)
+    trechos = [(entrada, p, min(tamanho_bloco, tamanho - p)) for p in range(0, tamanho, tamanho_bloco)]
+
+    comp = None
+    if modo == 'global':
+        contagem = np.zeros(256, dtype=np.int64)
+        for c in _executa(processos, _conta, trechos):
+            contagem += c
+        comp = comprimentos({s: int(c) for s, c in enumerate(contagem) if c > 0})
+
+    indice = []
+    with open(saida, 'wb') as fout:
+        fout.write(MAGICO)
+        fout.write(bytes([MODOS[modo]]))
+        fout.write(tamanho_bloco.to_bytes(8, 'big'))
+        if comp is not None:
+            fout.write(_comprimentos_bytes(comp))
+        tarefas = [t + (comp,) for t in trechos]
+        for dados, original in _executa(processos, _codifica_bloco, tarefas):
+            indice.append((fout.tell(), len(dados), original))
+            fout.write(dados)
+
+        posicao_indice = fout.tell()
+        fout.write(len(indice).to_bytes(8, 'big'))
+        for campos in indice:
+            for x in campos:
+                fout.write(x.to_bytes(8, 'big'))
+        fout.write(posicao_indice.to_bytes(8, 'big'))
+        escritos = fout.tell()
+
+    return tamanho, escritos, len(indice)
+
+
+def le_indice(caminho):
+    """
+    Devolve (comprimentos globais ou None, lista de blocos), onde cada bloco
+    e (posicao, tamanho comprimido, tamanho original).
+    """
+    with open(caminho, 'rb') as f:
+        if f.read(4) != MAGICO:
+            raise ValueError("Arquivo nao esta no formato HUFB.")
+        modo = f.read(1)[0]
+        f.read(8)                               # tamanho do bloco (informativo)
+        comp = None
+        if modo == MODOS['global']:
+            comp = {s: c for s, c in enumerate(f.read(256)) if c > 0}
+        f.seek(-8, os.SEEK_END)
+        f.seek(int.from_bytes(f.read(8), 'big'))
+        n = int.from_bytes(f.read(8), 'big')
+        dados = f.read(24 * n)
+        if len(dados) != 24 * n:
+            raise ValueError("Indice HUFB truncado.")
+        blocos = [tuple(int.from_bytes(dados[i + 8 * j:i + 8 * j + 8], 'big') for j in range(3))
+                  for i in range(0, 24 * n, 24)]
+    return comp, blocos
+
+
+def le_bloco(caminho, i):
+    """Acesso aleatorio: descomprime apenas o bloco i."""
+    comp, blocos = le_indice(caminho)
+    posicao, tamanho, original = blocos[i]
+    return _decodifica_bloco((caminho, posicao, tamanho, original, comp))
+
+
+def descomprime_arquivo(entrada, saida, processos=None):
+    """Descomprime `entrada` (formato HUFB) em `saida`, blocos em paralelo."""
+    if processos is None:
+        processos = os.cpu_count() or 1
+    comp, blocos = le_indice(entrada)
+    tarefas = [(entrada, p, t, o, comp) for (p, t, o) in blocos]
+    total = 0
+    with open(saida, 'wb') as fout:
+        for dados in _executa(processos, _decodifica_bloco, tarefas):
+            fout.write(dados)
+            total += len(dados)
+    return total
+
+
+def _run_tests():
+    import random
+    import tempfile
+
+    rng = random.Random(0)
+    casos = [b'', b'x', b'abracadabra' * 50,
+             bytes(rng.choice(b'aaaaaabbbcd\n') for _ in range(5000)) + bytes(range(256)) * 4]
+    with tempfile.TemporaryDirectory() as d:
+        entrada = os.path.join(d, "dados")
+        z = os.path.join(d, "dados.hufb")
+        volta = os.path.join(d, "dados.out")
+        for dados in casos:
+            with open(entrada, 'wb') as f:
+                f.write(dados)
+            for modo in MODOS:
+                for bloco, processos in ((7, 1), (1000, 1), (333, 2)):
+                    original, _, n = comprime_arquivo(entrada, z, modo, bloco, processos)
+                    assert original == len(dados)
+                    assert n == -(-len(dados) // bloco)
+                    assert descomprime_arquivo(z, volta, processos) == len(dados)
+                    with open(volta, 'rb') as f:
+                        assert f.read() == dados
+                    for i in range(n):
+                        assert le_bloco(z, i) == dados[i * bloco:(i + 1) * bloco]
+
+    print("Todos os testes da compressao em blocos passaram.")
+
+
+if __name__ == "__main__":
+    _run_tests()
+
+    import time
+    for modo in MODOS:
+        inicio = time.time()
+        original, comprimido, n = comprime_arquivo("alice.txt", "alice.txt.hufb", modo, 1 << 15)
+        print(modo, ":", original, "->", comprimido, "bytes,", n, "blocos,", time.time() - inicio, "segundos")
+        inicio = time.time()
+        descomprime_arquivo("alice.txt.hufb", "alice.txt.out")
+        print("descompressao em", time.time() - inicio, "segundos; bloco 2:", le_bloco("alice.txt.hufb", 2)[:40])
+    os.remove("alice.txt.hufb")
+    os.remove("alice.txt.out")
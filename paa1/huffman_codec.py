@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Compressor/descompressor de arquivos com codigo de Huffman canonico.
+
+`huffman.py` constroi o codigo e apenas estima o tamanho comprimido. Aqui o
+codigo e usado de fato, byte a byte, sobre arquivos de qualquer tamanho:
+
+1. Histograma: o arquivo e lido em blocos de tamanho fixo e os bytes de cada
+   bloco sao contados com `np.bincount` (256 contadores ao todo).
+2. Comprimentos: `huffman(p)` e `tree2code_iterativo(t)` de `huffman.py`
+   fornecem o comprimento do codigo de cada byte (opcionalmente limitado a
+   um maximo de bits, pelo package-merge).
+3. Codigo canonico: apenas os comprimentos sao gravados no cabecalho; os
+   codigos sao reconstruidos ordenando os simbolos por (comprimento, byte) e
+   numerando-os consecutivamente. Nao e preciso gravar a arvore.
+4. Empacotamento: cada bloco vira a concatenacao dos codigos dos seus bytes,
+   convertida em bytes de 8 bits e acumulada em um `bytearray` que e gravado
+   ao encher. Os bits que sobram de um bloco passam para o seguinte.
+
+A memoria usada e limitada pelo tamanho do bloco, nao pelo tamanho do
+arquivo. A entrada e lida duas vezes (histograma e codificacao).
+
+Formato do arquivo comprimido:
+
+    'HUF1' | numero de bytes originais (8 bytes, big-endian)
+           | comprimento do codigo de cada byte 0..255 (256 bytes, 0 = ausente)
+           | bits dos codigos, completados com zeros ate o fim do ultimo byte
+"""
+
+import io
+
+import numpy as np
+
+from huffman import codigo_canonico, comprimentos_limitados, huffman, tree2code_iterativo
+
+
+MAGICO = b'HUF1'
+TAMANHO_BLOCO = 1 << 20
+
+
+def histograma(fin, tamanho_bloco=TAMANHO_BLOCO):
+    """Conta os bytes do fluxo binario fin, lido em blocos. Devolve {byte: frequencia}."""
+    contagem = np.zeros(256, dtype=np.int64)
+    while True:
+        bloco = fin.read(tamanho_bloco)
+        if not bloco:
+            break
+        contagem += np.bincount(np.frombuffer(bloco, dtype=np.uint8), minlength=256)
+    return {s: int(c) for s, c in enumerate(contagem) if c > 0}
+
+
+def comprimentos(hist, comprimento_maximo=None):
+    """
+    Comprimento do codigo de Huffman de cada simbolo do histograma. Com
+    comprimento_maximo, usa o package-merge de `huffman.py` para que nenhum
+    codigo passe desse limite.
+    """
+    if not hist:
+        return {}
+    if len(hist) == 1:
+        return {s: 1 for s in hist}     # um unico simbolo ainda precisa de 1 bit
+    if comprimento_maximo is not None:
+        return comprimentos_limitados(hist, comprimento_maximo)
+    return {s: n for s, (_, n) in tree2code_iterativo(huffman(hist)).items()}
+
+
+# {simbolo: (codigo, comprimento)} a partir dos comprimentos
+codigos_canonicos = codigo_canonico
+
+
+def escreve_cabecalho(fout, total, comp):
+    fout.write(MAGICO)
+    fout.write(total.to_bytes(8, 'big'))
+    fout.write(bytes(comp.get(s, 0) for s in range(256)))
+
+
+def le_cabecalho(fin):
+    """Devolve (total de bytes originais, {byte: comprimento})."""
+    if fin.read(4) != MAGICO:
+        raise ValueError("Arquivo nao esta no formato HUF1.")
+    total = int.from_bytes(fin.read(8), 'big')
+    tabela = fin.read(256)
+    if len(tabela) != 256:
+        raise ValueError("Cabecalho HUF1 truncado.")
+    return total, {s: c for s, c in enumerate(tabela) if c > 0}
+
+
+class Empacotador:
+    """
+    Converte sequencias de bytes em bits (codigos concatenados) e os grava
+    em fout, em bytes completos, usando um bytearray como buffer.
+    """
+
+    def __init__(self, fout, codigos, tamanho_buffer=TAMANHO_BLOCO):
+        # tabela[b] = codigo do byte b como string de '0' e '1'
+        self.tabela = [''] * 256
+        for s, (c, n) in codigos.items():
+            self.tabela[s] = format(c, f'0{n}b')
+        self.fout = fout
+        self.buffer = bytearray()
+        self.tamanho_buffer = tamanho_buffer
+        self.resto = ''          # bits que ainda nao completam um byte
+        self.escritos = 0
+
+    def adiciona(self, bloco):
+        bits = self.resto + ''.join(map(self.tabela.__getitem__, bloco))
+        k = len(bits) - len(bits) % 8
+        if k:
+            self.buffer += int(bits[:k], 2).to_bytes(k // 8, 'big')
+        self.resto = bits[k:]
+        if len(self.buffer) >= self.tamanho_buffer:
+            self._descarrega()
+
+    def _descarrega(self):
+        self.fout.write(self.buffer)
+        self.escritos += len(self.buffer)
+        self.buffer = bytearray()
+
+    def termina(self):
+        if self.resto:
+            self.buffer.append(int(self.resto.ljust(8, '0'), 2))
+            self.resto = ''
+        self._descarrega()
+        return self.escritos
+
+
+def codifica(fin, fout, tamanho_bloco=TAMANHO_BLOCO, comprimento_maximo=None):
+    """
+    Comprime o fluxo binario fin (que precisa permitir seek) em fout.
+    Devolve (bytes originais, bytes gravados).
+    """
+    inicio = fin.tell()
+    hist = histograma(fin, tamanho_bloco)
+    total = sum(hist.values())
+    comp = comprimentos(hist, comprimento_maximo)
+    escreve_cabecalho(fout, total, comp)
+
+    fin.seek(inicio)
+    emp = Empacotador(fout, codigos_canonicos(comp), tamanho_bloco)
+    while True:
+        bloco = fin.read(tamanho_bloco)
+        if not bloco:
+            break
+        emp.adiciona(bloco)
+    return total, 4 + 8 + 256 + emp.termina()
+
+
+class DecodificadorCanonico:
+    """
+    Decodificacao bit a bit de um codigo canonico, sem arvore.
+
+    Para cada comprimento n guardamos o primeiro codigo de comprimento n e
+    quantos codigos tem esse comprimento. Um prefixo de n bits com valor c e
+    um codigo completo se primeiro[n] <= c < primeiro[n] + contagem[n].
+    """
+
+    def __init__(self, comp):
+        self.simbolos = sorted(comp, key=lambda s: (comp[s], s))
+        maximo = max(comp.values(), default=0)
+        self.contagem = [0] * (maximo + 1)
+        for n in comp.values():
+            self.contagem[n] += 1
+        self.primeiro = [0] * (maximo + 1)
+        self.indice = [0] * (maximo + 1)   # posicao do primeiro simbolo de comprimento n
+        codigo = 0
+        indice = 0
+        for n in range(1, maximo + 1):
+            codigo = (codigo + self.contagem[n - 1]) << 1
+            self.primeiro[n] = codigo
+            self.indice[n] = indice
+            indice += self.contagem[n]
+
+    def decodifica(self, fin, fout, total, tamanho_bloco=TAMANHO_BLOCO):
+        simbolos, primeiro, contagem, indice = self.simbolos, self.primeiro, self.contagem, self.indice
+        saida = bytearray()
+        codigo = 0
+        n = 0
+        restantes = total
+        while restantes > 0:
+            bloco = fin.read(tamanho_bloco)
+            if not bloco:
+                raise ValueError("Arquivo comprimido truncado.")
+            bits = format(int.from_bytes(bloco, 'big'), f'0{8 * len(bloco)}b')
+            for b in bits:
+                codigo = (codigo << 1) | (b == '1')
+                n += 1
+                d = codigo - primeiro[n]
+                if d < contagem[n]:
+                    saida.append(simbolos[indice[n] + d])
+                    codigo = 0
+                    n = 0
+                    restantes -= 1
+                    if restantes == 0:
+                        break
+            fout.write(saida)
+            saida = bytearray()
+
+
+def decodifica(fin, fout, tamanho_bloco=TAMANHO_BLOCO):
+    """Descomprime o fluxo fin (formato HUF1) em fout. Devolve o numero de bytes."""
+    total, comp = le_cabecalho(fin)
+    DecodificadorCanonico(comp).decodifica(fin, fout, total, tamanho_bloco)
+    return total
+
+
+def codifica_arquivo(entrada, saida, tamanho_bloco=TAMANHO_BLOCO, comprimento_maximo=None):
+    with open(entrada, 'rb') as fin, open(saida, 'wb') as fout:
+        return codifica(fin, fout, tamanho_bloco, comprimento_maximo)
+
+
+def decodifica_arquivo(entrada, saida, tamanho_bloco=TAMANHO_BLOCO):
+    with open(entrada, 'rb') as fin, open(saida, 'wb') as fout:
+        return decodifica(fin, fout, tamanho_bloco)
+
+
+def comprime(dados, tamanho_bloco=TAMANHO_BLOCO, comprimento_maximo=None):
+    """Atalho em memoria: bytes -> bytes comprimidos."""
+    fout = io.BytesIO()
+    codifica(io.BytesIO(dados), fout, tamanho_bloco, comprimento_maximo)
+    return fout.getvalue()
+
+
+def descomprime(dados, tamanho_bloco=TAMANHO_BLOCO):
+    """Atalho em memoria: bytes comprimidos -> bytes originais."""
+    fout = io.BytesIO()
+    decodifica(io.BytesIO(dados), fout, tamanho_bloco)
+    return fout.getvalue()
+
+
+def _run_tests():
+    import random
+
+    for dados in (b'', b'a', b'aaaa', b'abracadabra', bytes(range(256)) * 3):
+        for bloco in (1, 3, TAMANHO_BLOCO):
+            assert descomprime(comprime(dados, bloco), bloco) == dados
+
+    # o codigo canonico e livre de prefixo e respeita os comprimentos
+    comp = {ord('A'): 1, ord('B'): 2, ord('C'): 3, ord('D'): 3}
+    assert codigos_canonicos(comp) == {65: (0b0, 1), 66: (0b10, 2), 67: (0b110, 3), 68: (0b111, 3)}
+
+    rng = random.Random(0)
+    dados = bytes(rng.choice(b'aaaaaabbbcd\n') for _ in range(10000))
+    z = comprime(dados, 777)
+    assert descomprime(z, 555) == dados
+    assert len(z) < len(dados) // 2
+
+    # codigos limitados: distribuicao de Fibonacci gera codigos de ate 29 bits
+    fib = [1, 1]
+    while len(fib) < 30:
+        fib.append(fib[-1] + fib[-2])
+    dados = b''.join(bytes([s]) * fib[s] for s in range(30))
+    assert max(le_cabecalho(io.BytesIO(comprime(dados)))[1].values()) == 29
+    z = comprime(dados, comprimento_maximo=12)
+    assert max(le_cabecalho(io.BytesIO(z))[1].values()) == 12
+    assert descomprime(z) == dados
+
+    try:
+        descomprime(b'XXXX' + bytes(300))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Cabecalho invalido deve ser rejeitado.")
+
+    print("Todos os testes do codec de Huffman passaram.")
+
+
+if __name__ == "__main__":
+    _run_tests()
+
+    import os
+    import time
+
+    # Comprime e descomprime "alice.txt" (na mesma pasta do script)
+    inicio = time.time()
+    original, comprimido = codifica_arquivo("alice.txt", "alice.txt.huf")
+    print("Compressao:", original, "->", comprimido, "bytes em", time.time() - inicio, "segundos")
+    inicio = time.time()
+    decodifica_arquivo("alice.txt.huf", "alice.txt.out")
+    print("Descompressao em", time.time() - inicio, "segundos")
+    with open("alice.txt", 'rb') as a, open("alice.txt.out", 'rb') as b:
+        assert a.read() == b.read()
+    os.remove("alice.txt.huf")
+    os.remove("alice.txt.out")
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Decodificacao de Huffman por tabela (k bits por consulta).
+
+Decodificar percorrendo a arvore ('node', esq, dir) de `huffman.py` custa
+um passo por bit. Com um codigo canonico (ver `huffman_codec.py`) podemos
+olhar os proximos k bits de uma vez e consultar uma tabela de 2^k entradas:
+
+- todo codigo de comprimento n <= k ocupa as 2^(k-n) entradas cujos n
+  primeiros bits sao o codigo; a entrada guarda (simbolo, n);
+- entradas que sao prefixo de um codigo mais longo que k guardam n = 0 e
+  caem no caminho lento: o codigo canonico e completado bit a bit a partir
+  do comprimento k + 1, com os vetores primeiro[] e contagem[].
+
+Como os simbolos frequentes tem codigos curtos, quase todos os simbolos
+saem com uma consulta a tabela. Alem disso, uma segunda tabela guarda, para
+cada entrada, todos os codigos completos contidos nos k bits (por exemplo,
+tres codigos de 4 bits em k = 12), que saem de uma vez. Os bits sao lidos
+128 de cada vez para um inteiro acumulador.
+
+`DecodificadorTabela` tem a mesma interface de `DecodificadorCanonico` e le o
+formato HUF1 de `huffman_codec.py`. Rode o arquivo para comparar as
+velocidades (MB/s) com a decodificacao pela arvore.
+"""
+
+import io
+
+from huffman_codec import (TAMANHO_BLOCO, DecodificadorCanonico, codigos_canonicos,
+                           le_cabecalho)
+
+
+class DecodificadorTabela(DecodificadorCanonico):
+
+    def __init__(self, comp, k=10):
+        super().__init__(comp)
+        self.maximo = len(self.contagem) - 1
+        self.k = k
+        # tabela em dois vetores paralelos: simbolo e comprimento (0 = codigo longo)
+        self.tab_simbolo = [0] * (1 << k)
+        self.tab_comp = [0] * (1 << k)
+        for s, (c, n) in codigos_canonicos(comp).items():
+            if n <= k:
+                base = c << (k - n)
+                for i in range(base, base + (1 << (k - n))):
+                    self.tab_simbolo[i] = s
+                    self.tab_comp[i] = n
+
+        # tabela de varios simbolos: todos os codigos completos dentro dos k
+        # bits da entrada, e o total de bits que eles ocupam
+        self.tab_bytes = [b''] * (1 << k)
+        self.tab_bits = [0] * (1 << k)
+        mascara = (1 << k) - 1
+        for i in range(1 << k):
+            simbolos = bytearray()
+            usados = 0
+            while True:
+                j = (i << usados) & mascara     # bits restantes alinhados a esquerda
+                n = self.tab_comp[j]
+                if n == 0 or usados + n > k:
+                    break
+                simbolos.append(self.tab_simbolo[j])
+                usados += n
+            self.tab_bytes[i] = bytes(simbolos)
+            self.tab_bits[i] = usados
+
+    def _longo(self, acc, nbits):
+        """Caminho lento: completa um codigo mais longo que k bits."""
+        primeiro, contagem = self.primeiro, self.contagem
+        for n in range(self.k + 1, self.maximo + 1):
+            d = ((acc >> (nbits - n)) & ((1 << n) - 1)) - primeiro[n]
+            if d < contagem[n]:
+                return self.simbolos[self.indice[n] + d], n
+        raise ValueError("Sequencia de bits invalida.")
+
+    def decodifica(self, fin, fout, total, tamanho_bloco=TAMANHO_BLOCO):
+        k = self.k
+        tab_simbolo, tab_comp = self.tab_simbolo, self.tab_comp
+        tab_bytes, tab_bits = self.tab_bytes, self.tab_bits
+        mascara = (1 << k) - 1
+        precisa = max(k, self.maximo)   # bits que garantem qualquer consulta
+        saida = bytearray()
+        acc = 0                         # bits ainda nao consumidos
+        nbits = 0
+        restantes = total
+        bloco = b''
+        pos = 0
+        fim = False
+        enchimento = 0                  # zeros acrescentados apos o fim do arquivo
+        while restantes > 0:
+            # reabastece o acumulador
+            while nbits < precisa:
+                if pos + 16 <= len(bloco):
+                    acc = (acc << 128) | int.from_bytes(bloco[pos:pos + 16], 'big')
+                    pos += 16
+                    nbits += 128
+                elif pos < len(bloco):
+                    acc = (acc << 8) | bloco[pos]
+                    pos += 1
+                    nbits += 8
+                elif not fim:
+                    fout.write(saida)
+                    saida = bytearray()
+                    bloco = fin.read(tamanho_bloco)
+                    pos = 0
+                    fim = not bloco
+                else:
+                    # fim do arquivo: completa com zeros para a consulta
+                    acc <<= precisa - nbits
+                    enchimento += precisa - nbits
+                    nbits = precisa
+
+            # consome simbolos enquanto houver bits suficientes
+            while nbits >= precisa and restantes > 0:
+                i = (acc >> (nbits - k)) & mascara
+                m = tab_bits[i]
+                if m and len(tab_bytes[i]) <= restantes:
+                    # caminho rapido: todos os simbolos contidos nos k bits
+                    saida += tab_bytes[i]
+                    nbits -= m
+                    restantes -= len(tab_bytes[i])
+                    continue
+                n = tab_comp[i]
+                if n:
+                    saida.append(tab_simbolo[i])
+                else:
+                    s, n = self._longo(acc, nbits)
+                    saida.append(s)
+                nbits -= n
+                restantes -= 1
+            if nbits < enchimento:
+                raise ValueError("Arquivo comprimido truncado.")
+            acc &= (1 << nbits) - 1
+        fout.write(saida)
+
+
+def decodifica_tabela(fin, fout, k=10, tamanho_bloco=TAMANHO_BLOCO):
+    """Descomprime o fluxo fin (formato HUF1) com tabela de k bits."""
+    total, comp = le_cabecalho(fin)
+    DecodificadorTabela(comp, k).decodifica(fin, fout, total, tamanho_bloco)
+    return total
+
+
+def descomprime_tabela(dados, k=10, tamanho_bloco=TAMANHO_BLOCO):
+    fout = io.BytesIO()
+    decodifica_tabela(io.BytesIO(dados), fout, k, tamanho_bloco)
+    return fout.getvalue()
+
+
+####################################################
+# Referencia: decodificacao percorrendo a arvore, um bit por passo
+
+def arvore_canonica(comp):
+    """Arvore ('node', esq, dir) / ('leaf', s) do codigo canonico."""
+    def insere(t, s, bits):
+        if not bits:
+            return ('leaf', s)
+        if t is None:
+            t = ('node', None, None)
+        if bits[0] == '0':
+            return ('node', insere(t[1], s, bits[1:]), t[2])
+        return ('node', t[1], insere(t[2], s, bits[1:]))
+
+    t = None
+    for s, (c, n) in codigos_canonicos(comp).items():
+        t = insere(t, s, format(c, f'0{n}b'))
+    return t
+
+
+def decodifica_arvore(fin, fout, tamanho_bloco=TAMANHO_BLOCO):
+    total, comp = le_cabecalho(fin)
+    raiz = arvore_canonica(comp)
+    saida = bytearray()
+    t = raiz
+    restantes = total
+    while restantes > 0:
+        bloco = fin.read(tamanho_bloco)
+        if not bloco:
+            raise ValueError("Arquivo comprimido truncado.")
+        for b in format(int.from_bytes(bloco, 'big'), f'0{8 * len(bloco)}b'):
+            t = t[1] if b == '0' else t[2]
+            if t[0] == 'leaf':
+                saida.append(t[1])
+                t = raiz
+                restantes -= 1
+                if restantes == 0:
+                    break
+        fout.write(saida)
+        saida = bytearray()
+    return total
+
+
+def _run_tests():
+    import random
+    from huffman_codec import comprime
+
+    rng = random.Random(0)
+    casos = [b'', b'a', b'aaaa', b'abracadabra', bytes(range(256)) * 3]
+    # distribuicao de Fibonacci: codigos muito longos (mais que k bits)
+    fib = [1, 1]
+    while len(fib) < 30:
+        fib.append(fib[-1] + fib[-2])
+    pesos = {s: fib[s] for s in range(30)}
+    casos.append(bytes(rng.choices(list(pesos), weights=list(pesos.values()), k=20000)) + bytes(range(30)))
+
+    for dados in casos:
+        z = comprime(dados)
+        for k in (1, 4, 8, 12):
+            for bloco in (1, 5, TAMANHO_BLOCO):
+                assert descomprime_tabela(z, k, bloco) == dados
+        fout = io.BytesIO()
+        decodifica_arvore(io.BytesIO(z), fout)
+        assert fout.getvalue() == dados
+
+    try:
+        descomprime_tabela(comprime(b'abracadabra')[:-2])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Entrada truncada deve ser rejeitada.")
+
+    print("Todos os testes da decodificacao por tabela passaram.")
+
+
+def benchmark(caminho="alice.txt", repeticoes=3):
+    """Velocidade de descompressao (MB/s) pela arvore e por tabelas de k bits."""
+    import time
+    from huffman_codec import comprime, decodifica
+
+    with open(caminho, 'rb') as f:
+        dados = f.read()
+    z = comprime(dados)
+    mb = len(dados) / 1e6
+
+    metodos = [('arvore (bit a bit)', lambda fin, fout: decodifica_arvore(fin, fout)),
+               ('canonico (bit a bit)', lambda fin, fout: decodifica(fin, fout))]
+    for k in (8, 10, 12):
+        metodos.append((f'tabela k={k}', lambda fin, fout, k=k: decodifica_tabela(fin, fout, k)))
+
+    for nome, f in metodos:
+        melhor = float('inf')
+        for _ in range(repeticoes):
+            fout = io.BytesIO()
+            inicio = time.perf_counter()
+            f(io.BytesIO(z), fout)
+            melhor = min(melhor, time.perf_counter() - inicio)
+            assert fout.getvalue() == dados
+        print(f"{nome:22s} {mb / melhor:8.2f} MB/s")
+
+
+if __name__ == "__main__":
+    _run_tests()
+    benchmark()
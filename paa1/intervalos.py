@@ -37,6 +37,17 @@ def terminaMaisCedo(l):
 #print(terminaMaisCedo(interv_a))
 
 
+# mesma solução de terminaMaisCedo em O(n log n): percorre a lista ordenada por índice e insere no fim
+def terminaMaisCedoRapido(l):
+	lista = sorted(l,key=lambda x:x[1])               # ordena lista de intervalos pelo segundo componente (fim)
+	a     = []                                        # intervalos selecionados, na ordem em que foram escolhidos
+	for h in lista:                                   # percorre a lista sem removê-los (pop(0) custa O(n))
+		if not a or h[0] > a[-1][1]:                  # se o intervalo h é compatível com o último inserido na solução
+			a.append(h)                               # append custa O(1), insert(0,h) custa O(n)
+	a.reverse()                                       # mesma ordem de terminaMaisCedo (último escolhido na frente)
+	return a
+
+
 
 ####################################################################################
 ###         Particionamento de intervalos 
@@ -63,6 +74,28 @@ def iniciaMaisCedo(l):
 
 
 
+# mesma alocação de iniciaMaisCedo em O(n log n). Em vez de percorrer todas as salas para cada tarefa,
+# mantém duas heaps: salas ocupadas, com chave = tempo de liberação, e salas livres, com chave = número da sala.
+# Como as tarefas chegam em ordem de início, uma sala liberada continua livre até receber outra tarefa, e
+# a menor sala livre é exatamente a primeira sala encontrada pelo laço de iniciaMaisCedo.
+def iniciaMaisCedoRapido(l):
+	lista    = sorted(l,key=lambda x:x[0])  # ordena lista de intervalos pelo primeiro componente (inicio)
+	salas    = []                           # salas[i] = tarefas da sala i, na ordem de alocação
+	ocupadas = []                           # heap de pares (tempo-liberacao, nro sala)
+	livres   = []                           # heap de números de salas livres
+	for x in lista:
+		while ocupadas and ocupadas[0][0] <= x[0]:            # libera as salas que terminam até o início de x
+			heapq.heappush(livres, heapq.heappop(ocupadas)[1])
+		if livres:
+			i = heapq.heappop(livres)      # sala livre de menor número
+			salas[i].append(x)
+		else:
+			i = len(salas)                 # cria nova sala
+			salas.append([x])
+		heapq.heappush(ocupadas,(x[1],i))
+	return {i: t[::-1] for i,t in enumerate(salas)}  # mesmo formato: última tarefa inserida na frente
+
+
 #print(iniciaMaisCedo(interv_d))
 #start_time = time.time() 
 #a = iniciaMaisCedo([(0,1)]*10000)
@@ -100,6 +133,37 @@ def iniciaMaisCedoHeap(l):
 	return aloca
 	
 
+# mesma heap de iniciaMaisCedoHeap em O(n log n). As tarefas de cada sala ficam em listas à parte, preenchidas
+# com append; a heap guarda só os pares (tempo-liberacao, nro sala). Como os números de sala são distintos, as
+# listas nunca são comparadas pela heap, e a mesma sequência de operações produz a mesma heap.
+def iniciaMaisCedoHeapRapido(l):
+	
+	lista = sorted(l,key=lambda x:x[0])    # ordena lista de intervalos pelo primeiro componente (inicio)
+	if not lista:
+		return []
+
+	salas = [[lista[0]]]                   # salas[s] = tarefas da sala s, na ordem de alocação
+	aloca = [(lista[0][1],0)]              # heap de pares (tempo-liberacao, nro sala)
+
+	for k in range(1,len(lista)):          # percorre por índice em vez de pop(0)
+		
+		x = lista[k]
+
+		(f,s) = aloca[0]                   # sala de término mínimo
+
+		if x[0] <= f:                      # conflito: cria nova sala
+			n = len(aloca)
+			salas.append([x])
+			heapq.heappush(aloca,(x[1],n))
+
+		else:                              # sala s recebe x
+			heapq.heappop(aloca)
+			salas[s].append(x)
+			heapq.heappush(aloca,(x[1],s))
+
+	return [(f,s,salas[s][::-1]) for (f,s) in aloca]   # mesmo formato: (tempo-liberacao, nro sala, lista de tarefas)
+
+
 #start_time = time.time() 
 #a = iniciaMaisCedoHeap(interv_d)
 #end_time = time.time()
@@ -125,6 +189,120 @@ def minimizaAtraso(l):
 		a.append((h[0],t,t+h[1]))                     # aloca a tarefa x no intervalo (t, t+duracao), gerando tripla (x,t,t+duracao) na saida
 		t = t + h[1]                                  # atualiza o tempo atual
 	return a                                          # devolve saida
-	
-	
-print(minimizaAtraso(interv_e))
+
+
+# mesmo escalonamento de minimizaAtraso em O(n log n): percorre a lista ordenada sem pop(0)
+def minimizaAtrasoRapido(l):
+	t = 0
+	a = []
+	for h in sorted(l,key=lambda x:x[2]):             # ordena pelo deadline
+		a.append((h[0],t,t+h[1]))
+		t = t + h[1]
+	return a
+
+
+# minimização do atraso máximo com tempos de liberação e preempção (earliest deadline first).
+# Recebe tarefas (nome,duracao,deadline,liberacao). A cada instante executa, entre as tarefas já liberadas,
+# a de menor deadline (heap com chave = deadline); quando uma nova tarefa é liberada, ela interrompe a atual
+# se tiver deadline menor. Cada liberação causa no máximo uma interrupção: O(n log n).
+# Devolve a lista de trechos executados (nome,inicio,fim) e o atraso máximo.
+def minimizaAtrasoPreemptivo(l):
+	ordem  = sorted(range(len(l)),key=lambda k:l[k][3])   # índices das tarefas por tempo de liberação
+	resta  = [h[1] for h in l]                            # tempo de execução restante de cada tarefa
+	heap   = []                                           # tarefas liberadas: (deadline, índice)
+	a      = []                                           # trechos executados
+	ultima = -1                                           # tarefa do último trecho (para emendar trechos)
+	atraso = 0
+	t      = 0
+	k      = 0                                            # próxima tarefa a ser liberada
+	while k < len(ordem) or heap:
+		if not heap:                                      # processador ocioso: avança até a próxima liberação
+			t = max(t, l[ordem[k]][3])
+		while k < len(ordem) and l[ordem[k]][3] <= t:     # libera as tarefas com liberação até t
+			heapq.heappush(heap,(l[ordem[k]][2],ordem[k]))
+			k += 1
+
+		(d,j)   = heap[0]                                 # tarefa liberada de menor deadline
+		proxima = l[ordem[k]][3] if k < len(ordem) else float('inf')
+		passo   = min(resta[j], proxima - t)              # executa até terminar ou até a próxima liberação
+		if ultima == j and a[-1][2] == t:
+			a[-1] = (a[-1][0],a[-1][1],t+passo)           # continuação do mesmo trecho
+		else:
+			a.append((l[j][0],t,t+passo))
+		ultima = j
+		t        += passo
+		resta[j] -= passo
+		if resta[j] == 0:                                 # tarefa concluída no instante t
+			heapq.heappop(heap)
+			atraso = max(atraso, t - d)
+	return a, atraso
+
+
+####################################################################################
+###         Comparação de tempo
+####################################################################################
+
+def intervalosAleatorios(n, horizonte=None, duracao_maxima=100, semente=0):
+	import random
+	rng = random.Random(semente)
+	if horizonte is None:
+		horizonte = 10 * n
+	lista = []
+	for _ in range(n):
+		i = rng.randrange(horizonte)
+		lista.append((i, i + rng.randint(1,duracao_maxima)))
+	return lista
+
+
+def benchmark(n=10**6, n_original=10**5):
+	l = intervalosAleatorios(n)
+	p = [ ('t%d' % k, d - i, d) for k,(i,d) in enumerate(l) ]
+	funcoes = [ ('terminaMaisCedo', terminaMaisCedo, terminaMaisCedoRapido, l),
+	            ('iniciaMaisCedo', iniciaMaisCedo, iniciaMaisCedoRapido, l),
+	            ('iniciaMaisCedoHeap', iniciaMaisCedoHeap, iniciaMaisCedoHeapRapido, l),
+	            ('minimizaAtraso', minimizaAtraso, minimizaAtrasoRapido, p) ]
+	for (nome, original, rapida, entrada) in funcoes:
+		start_time = time.time()
+		original(entrada[:n_original])
+		t_original = time.time() - start_time
+		start_time = time.time()
+		rapida(entrada)
+		t_rapida = time.time() - start_time
+		print(nome, ": original com", n_original, "intervalos:", t_original, "segundos;", 
+		      "rápida com", n, "intervalos:", t_rapida, "segundos")
+
+
+if __name__ == "__main__":
+
+	print(minimizaAtraso(interv_e))
+
+	# as versões rápidas devolvem exatamente as mesmas soluções
+	testes = [ interv_a, interv_b, interv_c, interv_d, [(0,1)]*50, intervalosAleatorios(3000, 2000, 50, 1) ]
+	for x in testes:
+		assert terminaMaisCedoRapido(x)    == terminaMaisCedo(x)
+		assert iniciaMaisCedoRapido(x)     == iniciaMaisCedo(x)
+		assert iniciaMaisCedoHeapRapido(x) == iniciaMaisCedoHeap(x)
+		t = [ ('t%d' % k, d - i, d) for k,(i,d) in enumerate(x) ]
+		assert minimizaAtrasoRapido(t)     == minimizaAtraso(t)
+	assert minimizaAtrasoRapido(interv_e) == minimizaAtraso(interv_e)
+	print("Versões rápidas conferidas com as originais.")
+
+	# com todas as tarefas liberadas em t=0, o escalonamento preemptivo é o de minimizaAtraso
+	interv_f = [ (h[0],h[1],h[2],0) for h in interv_e ]
+	assert minimizaAtrasoPreemptivo(interv_f)[0] == minimizaAtraso(interv_e)
+	# 'b' é liberada em t=1 e interrompe 'a' por ter deadline menor
+	assert minimizaAtrasoPreemptivo([ ('a',4,10,0), ('b',2,4,1), ('c',1,20,9) ]) == \
+	       ([('a',0,1), ('b',1,3), ('a',3,6), ('c',9,10)], 0)
+	assert minimizaAtrasoPreemptivo([ ('a',5,3,0), ('b',1,2,1) ]) == ([('a',0,1), ('b',1,2), ('a',2,6)], 3)
+
+	import random
+	n = 10**6
+	tarefas = []
+	for k in range(n):
+		r = random.randrange(10*n)
+		tarefas.append(('t%d' % k, random.randint(1,15), r + random.randint(1,50), r))
+	start_time = time.time()
+	a, atraso = minimizaAtrasoPreemptivo(tarefas)
+	print("minimizaAtrasoPreemptivo com", n, "tarefas:", time.time() - start_time, "segundos; atraso máximo", atraso)
+
+	benchmark()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Particionamento de intervalos com NumPy (linha de varredura).
+
+Quando so interessa o numero minimo de salas (a profundidade: o maior numero
+de intervalos simultaneos), nao e preciso simular a heap de
+`iniciaMaisCedoHeap` em `intervalos.py`. Basta varrer os eventos em ordem de
+tempo, somando +1 em cada inicio e -1 em cada fim:
+
+1. concatena os inicios e os fins (inicios primeiro);
+2. `argsort` estavel pelos tempos: em tempos iguais, os inicios vem antes dos
+   fins, pois em `iniciaMaisCedoHeap` um intervalo que comeca no instante em
+   que outro termina conflita com ele (x[0] <= f);
+3. soma acumulada dos +1/-1 na ordem dos eventos; o maximo e a profundidade.
+
+Tudo roda em C sobre vetores, e funciona para dezenas de milhoes de
+intervalos.
+
+`salas` tambem devolve a sala de cada intervalo. A escolha de sala e
+inerentemente sequencial, entao e feita por um laco sobre os eventos ja
+ordenados, com uma fila das salas liberadas. A fila esta sempre ordenada por
+(tempo de liberacao, numero da sala), que e a chave da heap de
+`iniciaMaisCedoHeap`; por isso as salas sao exatamente as mesmas.
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+def _vetores(inicio, fim=None):
+    # aceita dois vetores ou uma lista de tuplas (inicio, fim)
+    if fim is None:
+        v = np.asarray(inicio)
+        if v.size == 0:
+            return np.empty(0), np.empty(0)
+        return v[:, 0], v[:, 1]
+    return np.asarray(inicio), np.asarray(fim)
+
+
+def perfil(inicio, fim=None):
+    """
+    Numero de intervalos ativos apos cada evento.
+    Devolve (tempos dos eventos, ativos), ambos de tamanho 2n.
+    """
+    inicio, fim = _vetores(inicio, fim)
+    n = len(inicio)
+    tempos = np.concatenate((inicio, fim))
+    ordem = np.argsort(tempos, kind='stable')          # inicios antes dos fins em empates
+    passo = np.ones(2 * n, dtype=np.int64)
+    passo[n:] = -1
+    return tempos[ordem], np.cumsum(passo[ordem])
+
+
+def profundidade(inicio, fim=None):
+    """Numero minimo de salas (maior numero de intervalos simultaneos)."""
+    _, ativos = perfil(inicio, fim)
+    return int(ativos.max()) if len(ativos) else 0
+
+
+def salas(inicio, fim=None):
+    """
+    Sala de cada intervalo (na ordem da entrada), igual a de `iniciaMaisCedoHeap`.
+    Devolve (vetor de salas, numero de salas).
+    """
+    inicio, fim = _vetores(inicio, fim)
+    n = len(inicio)
+    por_inicio = np.argsort(inicio, kind='stable').tolist()   # mesma ordem de sorted(l, key=x[0])
+    por_fim = np.argsort(fim, kind='stable').tolist()
+    ini = inicio.tolist()
+    fi = fim.tolist()
+
+    sala = [-1] * n
+    livres = deque()            # salas livres, em ordem de (liberacao, numero)
+    total = 0
+    j = 0                       # proximo intervalo a terminar
+    for i in por_inicio:
+        t = ini[i]
+        if j < n and fi[por_fim[j]] < t:
+            liberadas = []
+            while j < n and fi[por_fim[j]] < t:
+                k = por_fim[j]
+                liberadas.append((fi[k], sala[k]))
+                j += 1
+            liberadas.sort()
+            livres.extend(s for (_, s) in liberadas)
+        if livres:
+            sala[i] = livres.popleft()
+        else:
+            sala[i] = total
+            total += 1
+    return np.array(sala, dtype=np.int64), total
+
+
+def _run_tests():
+    import random
+    from intervalos import interv_d, iniciaMaisCedoHeapRapido, intervalosAleatorios
+
+    casos = [[], [(0, 1)], [(0, 1)] * 5, [(0, 1), (1, 2), (2, 3)], [(0, 1), (2, 3)], interv_d,
+             intervalosAleatorios(2000, 1500, 40, 3)]
+    rng = random.Random(0)
+    casos.append([(a, a + rng.randint(0, 5)) for a in (rng.randrange(50) for _ in range(500))])
+    for l in casos:
+        heap = iniciaMaisCedoHeapRapido(l)
+        assert profundidade(l) == len(heap)
+        if l:
+            assert profundidade([x[0] for x in l], [x[1] for x in l]) == len(heap)
+
+        # reconstroi a saida da heap a partir do vetor de salas
+        sala, total = salas(l)
+        assert total == len(heap)
+        ordem = sorted(range(len(l)), key=lambda i: l[i][0])
+        tarefas = [[] for _ in range(total)]
+        for i in ordem:
+            tarefas[sala[i]].append(l[i])
+        assert sorted((t[-1][1], s, t[::-1]) for s, t in enumerate(tarefas)) == sorted(heap)
+
+    print("Todos os testes do particionamento com NumPy passaram.")
+
+
+if __name__ == "__main__":
+    _run_tests()
+
+    import time
+    rng = np.random.default_rng(0)
+    for n in (10**6, 10**7):
+        inicio = rng.integers(0, 10 * n, n)
+        fim = inicio + rng.integers(1, 100, n)
+        t = time.time()
+        d = profundidade(inicio, fim)
+        print(n, "intervalos: profundidade", d, "em", time.time() - t, "segundos")
+    n = 10**6
+    inicio = rng.integers(0, 10 * n, n)
+    fim = inicio + rng.integers(1, 100, n)
+    t = time.time()
+    _, total = salas(inicio, fim)
+    print(n, "intervalos: atribuicao de", total, "salas em", time.time() - t, "segundos")
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Alocacao de salas online (reservas chegam uma a uma e podem ser canceladas).
+
+As funcoes de `intervalos.py` recebem a lista inteira e a ordenam antes de
+alocar. Aqui cada reserva e alocada assim que chega, com a mesma regra de
+`iniciaMaisCedoHeap`: a sala de menor (tempo de liberacao, numero) e usada se
+ficar livre antes do inicio da reserva; senao, uma sala nova e criada. Com as
+reservas chegando em ordem de inicio, as salas sao exatamente as de
+`iniciaMaisCedoHeap`; em outra ordem, a alocacao continua valida (sem
+conflitos), mas pode usar mais salas que o minimo.
+
+Estruturas:
+
+- heap de salas com chave (tempo de liberacao, numero), com remocao
+  preguicosa: cada sala tem uma versao, e entradas antigas sao descartadas
+  ao chegar ao topo. Salas esvaziadas por cancelamentos voltam com tempo
+  de liberacao -infinito;
+- por sala, um heap de maximo dos fins das reservas (tambem preguicoso),
+  para recalcular a liberacao apos um cancelamento;
+- uma treap (arvore binaria de busca balanceada por prioridades
+  aleatorias) de eventos (tempo, +1/-1), com a soma e o maior prefixo de
+  cada subarvore: o maior prefixo da raiz e o pico de sobreposicao;
+- uma treap de intervalos (arvore de intervalos) ordenada pelo inicio, com
+  o maior fim de cada subarvore, para saber quais salas estao ocupadas em t.
+
+Os intervalos sao fechados, como em `iniciaMaisCedoHeap`: (0, 2) e (2, 3)
+conflitam. Insercao, cancelamento e pico custam O(log n) (esperado ou
+amortizado). `sala_livre(t)` NAO atende ao requisito de O(log n): ela
+monta o conjunto das salas ocupadas em t percorrendo a treap de
+intervalos, o que custa O(min(n, (k + 1) log n)) esperado, onde k e o
+numero de reservas ativas em t, e depois olha ate k + 1 salas. Quando
+muitas reservas cobrem t, a consulta e Theta(n). Nao ha um agregado por
+subarvore que resolva isso: saber se uma sala esta livre depende do
+proprio t, entao o menor numero de sala livre nao pode ser mantido
+durante as atualizacoes para um t arbitrario.
+"""
+
+import heapq
+import random
+
+
+class _No:
+    __slots__ = ('chave', 'valor', 'prioridade', 'esq', 'dir', 'soma', 'prefixo', 'maximo')
+
+    def __init__(self, chave, valor, prioridade):
+        self.chave = chave
+        self.valor = valor
+        self.prioridade = prioridade
+        self.esq = None
+        self.dir = None
+        self.soma = valor
+        self.prefixo = max(0, valor)
+        self.maximo = valor
+
+
+def _atualiza(t):
+    e, d = t.esq, t.dir
+    soma_e = e.soma if e else 0
+    t.soma = soma_e + t.valor + (d.soma if d else 0)
+    # maior soma de um prefixo (o prefixo vazio vale 0)
+    t.prefixo = max(e.prefixo if e else 0, soma_e + t.valor + (d.prefixo if d else 0))
+    t.maximo = max(t.valor, e.maximo if e else t.valor, d.maximo if d else t.valor)
+
+
+def _divide(t, chave):
+    """Divide t em (chaves < chave, chaves >= chave)."""
+    if t is None:
+        return None, None
+    if t.chave < chave:
+        a, b = _divide(t.dir, chave)
+        t.dir = a
+        _atualiza(t)
+        return t, b
+    a, b = _divide(t.esq, chave)
+    t.esq = b
+    _atualiza(t)
+    return a, t
+
+
+def _junta(a, b):
+    """Junta duas treaps, com todas as chaves de a menores que as de b."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prioridade > b.prioridade:
+        a.dir = _junta(a.dir, b)
+        _atualiza(a)
+        return a
+    b.esq = _junta(a, b.esq)
+    _atualiza(b)
+    return b
+
+
+def _remove_minimo(t):
+    if t.esq is None:
+        return t.dir
+    t.esq = _remove_minimo(t.esq)
+    _atualiza(t)
+    return t
+
+
+class Treap:
+    """Treap com chaves unicas e agregados soma, maior prefixo e maior valor."""
+
+    def __init__(self, semente=0):
+        self.raiz = None
+        self.rng = random.Random(semente)
+
+    def insere(self, chave, valor):
+        a, b = _divide(self.raiz, chave)
+        self.raiz = _junta(_junta(a, _No(chave, valor, self.rng.random())), b)
+
+    def remove(self, chave):
+        a, b = _divide(self.raiz, chave)
+        self.raiz = _junta(a, _remove_minimo(b))    # a menor chave de b e a removida
+
+
+class AlocadorOnline:
+
+    def __init__(self):
+        self.reservas = {}     # id -> (inicio, fim, sala)
+        self.proximo_id = 0
+        self.salas = []        # salas[s] = {id: (inicio, fim)}, em ordem de alocacao
+        self.liberacao = []    # tempo de liberacao atual de cada sala
+        self.versao = []       # versao da entrada valida de cada sala no heap
+        self.heap = []         # (liberacao, sala, versao)
+        self.fins = []         # por sala, heap de (-fim, id)
+        self.eventos = Treap(1)
+        self.intervalos = Treap(2)
+
+    def _publica(self, s):
+        # registra no heap a liberacao atual da sala s, invalidando a anterior
+        self.versao[s] += 1
+        heapq.heappush(self.heap, (self.liberacao[s], s, self.versao[s]))
+
+    def insere(self, inicio, fim):
+        """Aloca a reserva [inicio, fim]. Devolve (id da reserva, sala)."""
+        heap = self.heap
+        while heap and heap[0][2] != self.versao[heap[0][1]]:
+            heapq.heappop(heap)                    # entrada desatualizada
+        if heap and heap[0][0] < inicio:
+            s = heap[0][1]                         # sala livre de menor (liberacao, numero)
+        else:
+            s = len(self.salas)                    # cria nova sala
+            self.salas.append({})
+            self.liberacao.append(float('-inf'))
+            self.versao.append(0)
+            self.fins.append([])
+
+        r = self.proximo_id
+        self.proximo_id += 1
+        self.reservas[r] = (inicio, fim, s)
+        self.salas[s][r] = (inicio, fim)
+        heapq.heappush(self.fins[s], (-fim, r))
+        self.liberacao[s] = max(self.liberacao[s], fim)
+        self._publica(s)
+
+        self.eventos.insere((inicio, 0, r), 1)     # em empates, inicios antes dos fins
+        self.eventos.insere((fim, 1, r), -1)
+        self.intervalos.insere((inicio, r), fim)
+        return r, s
+
+    def cancela(self, r):
+        """Cancela a reserva r, liberando sua sala."""
+        inicio, fim, s = self.reservas.pop(r)
+        del self.salas[s][r]
+        fins = self.fins[s]
+        while fins and fins[0][1] not in self.reservas:
+            heapq.heappop(fins)
+        nova = -fins[0][0] if fins else float('-inf')
+        if nova != self.liberacao[s]:
+            self.liberacao[s] = nova
+            self._publica(s)
+
+        self.eventos.remove((inicio, 0, r))
+        self.eventos.remove((fim, 1, r))
+        self.intervalos.remove((inicio, r))
+
+    def ocupadas(self, t):
+        """Conjunto das salas com alguma reserva ativa no instante t."""
+        salas = set()
+        pilha = [self.intervalos.raiz]
+        while pilha:
+            no = pilha.pop()
+            if no is None or no.maximo < t:
+                continue                           # nenhuma reserva da subarvore chega a t
+            pilha.append(no.esq)
+            if no.chave[0] <= t:                   # a direita, so inicios >= este
+                if no.valor >= t:
+                    salas.add(self.reservas[no.chave[1]][2])
+                pilha.append(no.dir)
+        return salas
+
+    def sala_livre(self, t):
+        """
+        Menor sala existente livre no instante t, ou None se todas estao
+        ocupadas. Nao e O(log n): custa O(min(n, (k + 1) log n)) esperado,
+        com k = numero de reservas ativas em t (o percurso de `ocupadas`),
+        mais O(k) para olhar as salas 0..k, entre as quais esta a menor livre.
+        """
+        ocupadas = self.ocupadas(t)
+        for s in range(len(ocupadas) + 1):
+            if s < len(self.salas) and s not in ocupadas:
+                return s
+        return None
+
+    def pico(self):
+        """Maior numero de reservas simultaneas entre as reservas atuais."""
+        return self.eventos.raiz.prefixo if self.eventos.raiz else 0
+
+    def como_heap(self):
+        """Salas no formato de `iniciaMaisCedoHeap`: (liberacao, sala, tarefas, ultima na frente)."""
+        return sorted((self.liberacao[s], s, list(t.values())[::-1])
+                      for s, t in enumerate(self.salas) if t)
+
+
+def _run_tests():
+    from intervalos import interv_d, iniciaMaisCedoHeap, intervalosAleatorios
+    from intervalos_numpy import profundidade
+
+    for l in (interv_d, [(0, 1)] * 5, [(0, 1), (1, 2), (2, 3)], intervalosAleatorios(3000, 2000, 40, 5)):
+        a = AlocadorOnline()
+        for x in sorted(l, key=lambda x: x[0]):
+            a.insere(*x)
+        assert a.como_heap() == sorted(iniciaMaisCedoHeap(l))
+        assert a.pico() == profundidade(l) == len(a.salas)
+
+    # ordem qualquer com cancelamentos: alocacao sem conflitos e pico correto
+    rng = random.Random(0)
+    a = AlocadorOnline()
+    ativas = {}
+    for passo in range(3000):
+        if ativas and rng.random() < 0.3:
+            r = rng.choice(list(ativas))
+            a.cancela(r)
+            del ativas[r]
+        else:
+            i = rng.randrange(500)
+            x = (i, i + rng.randrange(30))
+            r, s = a.insere(*x)
+            ativas[r] = x
+        if passo % 100 == 0:
+            assert a.pico() == profundidade(list(ativas.values()))
+            for t in a.salas:
+                reservas = sorted(t.values())
+                assert all(reservas[k][0] > reservas[k - 1][1] for k in range(1, len(reservas)))
+            t = rng.randrange(530)
+            ocupadas = {a.reservas[r][2] for r, (i, f) in ativas.items() if i <= t <= f}
+            assert a.ocupadas(t) == ocupadas
+            livres = [s for s in range(len(a.salas)) if s not in ocupadas]
+            assert a.sala_livre(t) == (livres[0] if livres else None)
+
+    print("Todos os testes do alocador online passaram.")
+
+
+if __name__ == "__main__":
+    _run_tests()
+
+    import time
+    from intervalos import intervalosAleatorios
+    n = 10**5
+    l = sorted(intervalosAleatorios(n), key=lambda x: x[0])
+    a = AlocadorOnline()
+    inicio = time.time()
+    ids = [a.insere(*x)[0] for x in l]
+    print(n, "insercoes em", time.time() - inicio, "segundos; pico", a.pico(), "salas", len(a.salas))
+    inicio = time.time()
+    for r in ids[::2]:
+        a.cancela(r)
+    print(n // 2, "cancelamentos em", time.time() - inicio, "segundos; pico", a.pico())
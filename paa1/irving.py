@@ -3,6 +3,8 @@
 import random
 from collections import deque
 
+import numpy as np
+
 
 def random_instance(n, seed=None):
     """
@@ -287,6 +289,197 @@ def irving(preferences: dict[str, list[str]], verbose=False):
     return matching, total_ops()
 
 
+def irving_arrays(pref):
+    """
+    Array-native version of irving on integer ids.
+
+    Args:
+        pref: int32 matrix n x (n-1); pref[p, k] = k-th choice of p
+              (as produced by matching_instances.random_roommates).
+
+    Returns:
+        (mate, total_ops): mate[p] = partner of p (int32 array), or None if no
+        stable matching exists; total_ops counted exactly as in irving.
+
+    The reduced lists are doubly linked lists stored in contiguous n*n int32
+    arrays (entry p*n + q), the ranks in another n*n array, and Phase 2 keeps
+    a pointer to the smallest person with size > 1. Sizes only decrease, so
+    the pointer only moves forward: the same person irving picks with
+    next(p for p in range(n) if size[p] > 1), without rescanning from 0.
+    """
+    pref = np.ascontiguousarray(pref, dtype=np.int32)
+    n = pref.shape[0]
+    m = n - 1
+    rows = np.arange(n, dtype=np.int64)[:, None] * n
+
+    # Flat arrays; memoryviews give plain-int indexing and assignment.
+    rank_a = np.full(n * n, n, dtype=np.int32)
+    rank_a[(rows + pref).ravel()] = np.tile(np.arange(m, dtype=np.int32), n)
+    left_a = np.full(n * n, -1, dtype=np.int32)
+    right_a = np.full(n * n, -1, dtype=np.int32)
+    if m > 1:
+        left_a[(rows + pref[:, 1:]).ravel()] = pref[:, :-1].ravel()
+        right_a[(rows + pref[:, :-1]).ravel()] = pref[:, 1:].ravel()
+    active_a = np.zeros(n * n, dtype=np.int8)
+    active_a[(rows + pref).ravel()] = 1
+
+    pref_f = memoryview(pref.ravel())
+    rank = memoryview(rank_a)
+    left = memoryview(left_a)
+    right = memoryview(right_a)
+    active = memoryview(active_a)
+    first = pref[:, 0].tolist()
+    last = pref[:, -1].tolist()
+    size = [m] * n
+
+    proposal_count = 0
+    deletion_count = 0
+    rotation_count = 0
+
+    def total_ops():
+        return proposal_count + deletion_count + rotation_count
+
+    def remove_one(p, q):
+        nonlocal deletion_count
+        pq = p * n + q
+        if not active[pq]:
+            return
+        a = left[pq]
+        b = right[pq]
+        if a != -1:
+            right[p * n + a] = b
+        else:
+            first[p] = b
+        if b != -1:
+            left[p * n + b] = a
+        else:
+            last[p] = a
+        active[pq] = 0
+        left[pq] = -1
+        right[pq] = -1
+        size[p] -= 1
+        deletion_count += 1
+
+    def delete_pair(a, b):
+        remove_one(a, b)
+        remove_one(b, a)
+
+    # Phase 1: proposals
+    hold = [-1] * n
+    next_idx = [0] * n
+    free = deque(range(n))
+
+    while free:
+        p = free.popleft()
+        while True:
+            k = next_idx[p]
+            while k < m and not active[p * n + pref_f[p * m + k]]:
+                k += 1
+            if k >= m:
+                return None, total_ops()
+            q = pref_f[p * m + k]
+            next_idx[p] = k + 1
+            proposal_count += 1
+
+            cur = hold[q]
+            if cur == -1:
+                hold[q] = p
+                break
+            if rank[q * n + p] < rank[q * n + cur]:
+                hold[q] = p
+                delete_pair(cur, q)
+                if size[cur] == 0 or size[q] == 0:
+                    return None, total_ops()
+                free.append(cur)
+                break
+            delete_pair(p, q)
+            if size[p] == 0 or size[q] == 0:
+                return None, total_ops()
+
+    # Early stop: everyone holds their mutual original first choice
+    if all(hold[p] != -1 and hold[hold[p]] == p and pref_f[p * m] == hold[p]
+           and pref_f[hold[p] * m] == p for p in range(n)):
+        return np.array(hold, dtype=np.int32), total_ops()
+
+    # Phase 1 reduction
+    for q in range(n):
+        p = hold[q]
+        if p == -1 or not active[q * n + p]:
+            return None, total_ops()
+        x = right[q * n + p]
+        while x != -1:
+            nx = right[q * n + x]
+            delete_pair(q, x)
+            if size[q] == 0 or size[x] == 0:
+                return None, total_ops()
+            x = nx
+
+    # Phase 2: rotations, with a forward-only pointer to the first size > 1
+    start = 0
+    while True:
+        while start < n and size[start] <= 1:
+            start += 1
+        if start == n:
+            break
+
+        seen = {}
+        p_seq = []
+        p = start
+        while p not in seen:
+            seen[p] = len(p_seq)
+            p_seq.append(p)
+            y = first[p]
+            z = right[p * n + y] if y != -1 else -1
+            if z == -1:
+                return None, total_ops()
+            p = last[z]
+            if p == -1:
+                return None, total_ops()
+
+        rotation_p = p_seq[seen[p]:]
+        rotation_y = [first[x] for x in rotation_p]
+        rotation_count += 1
+
+        for x, y in zip(rotation_p, rotation_y):
+            delete_pair(x, y)
+            if size[x] == 0 or size[y] == 0:
+                return None, total_ops()
+
+        for i, y in enumerate(rotation_y):
+            x_prev = rotation_p[i - 1]
+            if not active[y * n + x_prev]:
+                return None, total_ops()
+            t = right[y * n + x_prev]
+            while t != -1:
+                nt = right[y * n + t]
+                delete_pair(y, t)
+                if size[y] == 0 or size[t] == 0:
+                    return None, total_ops()
+                t = nt
+
+    for p in range(n):
+        q = first[p]
+        if q == -1 or first[q] != p:
+            return None, total_ops()
+    return np.array(first, dtype=np.int32), total_ops()
+
+
+def irving_numpy(preferences: dict[str, list[str]]):
+    """
+    Same interface and result as irving (matching, total_ops), computed by
+    irving_arrays on an integer preference matrix.
+    """
+    _validate_preferences(preferences)
+    names = list(preferences.keys())
+    name_to_idx = {name: i for i, name in enumerate(names)}
+    pref = np.array([[name_to_idx[q] for q in preferences[p]] for p in names],
+                    dtype=np.int32).reshape(len(names), len(names) - 1)
+    mate, ops = irving_arrays(pref)
+    if mate is None:
+        return None, ops
+    return {(names[p], names[q]) for p, q in enumerate(mate.tolist()) if p < q}, ops
+
+
 def _normalize(matching):
     return {frozenset(pair) for pair in matching}
 
@@ -386,6 +579,14 @@ def run_reference_tests():
     assert _is_stable(easy_mutual_top, easy_match)
     assert easy_ops == 6  # 6 proposals, 0 deletions, 0 rotations.
 
+    # Array-native version: same matching and same operation count
+    for case in (wiki_case, wiki_no_solution, transcript_no_solution, easy_mutual_top):
+        assert irving_numpy(case) == irving(case)
+    for n in (2, 4, 6, 10, 20, 50):
+        for seed in range(40):
+            case = random_instance(n, seed=seed)
+            assert irving_numpy(case) == irving(case)
+
 
 def main():
     run_reference_tests()
@@ -397,6 +598,17 @@ def main():
     print("Random instance matching:", matching)
     print("Operation count:", ops)
 
+    # Dict-of-lists version vs array-native version on a larger instance
+    import time
+    from matching_instances import random_roommates, to_name_dicts
+    pref = random_roommates(1000, seed=1)
+    start = time.perf_counter()
+    _, ops = irving(to_name_dicts(pref))
+    print(f"irving        n=1000: {ops} ops, {time.perf_counter() - start:.2f} s")
+    start = time.perf_counter()
+    _, ops = irving_arrays(pref)
+    print(f"irving_arrays n=1000: {ops} ops, {time.perf_counter() - start:.2f} s")
+
 
 if __name__ == "__main__":
     main()
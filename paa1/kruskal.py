@@ -92,4 +92,5 @@ def kruskal(v,e):
     
 
 #### chamada de teste (Kruskal)
-print(kruskal(v,e))
+if __name__ == "__main__":
+	print(kruskal(v,e))
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Kruskal em memoria externa.
+
+`kruskal.py` precisa de todas as arestas em uma unica lista ordenada. Quando
+a lista de arestas nao cabe na memoria, mas os nodos cabem, podemos:
+
+1. Ler o arquivo de arestas em blocos de tamanho limitado, ordenar cada
+   bloco em memoria e grava-lo como um arquivo temporario ordenado (run).
+2. Intercalar os k runs como um fluxo (`heapq.merge`), mantendo em memoria
+   apenas uma aresta por run.
+3. Alimentar o union-find (um dicionario por nodo) com esse fluxo, ja em
+   ordem crescente de peso, gravando cada aresta aceita no arquivo de saida
+   assim que ela e escolhida.
+
+Memoria usada: O(tamanho_bloco + k + V). Cada aresta e lida duas vezes e
+escrita uma vez em disco.
+
+Formato dos arquivos: uma aresta por linha, "u v peso", separados por
+espacos. Linhas vazias e linhas iniciadas por '#' sao ignoradas. Empates de
+peso sao resolvidos pela ordem das linhas na entrada, como na ordenacao
+estavel de `kruskal(v, e)`.
+"""
+
+import heapq
+import os
+import tempfile
+
+
+def _peso(texto):
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto)
+
+
+def _le_arestas(caminho):
+    """Gera (peso, linha, u, v, texto_do_peso) para cada aresta do arquivo."""
+    with open(caminho, encoding="utf-8") as f:
+        for linha, texto in enumerate(f):
+            campos = texto.split()
+            if not campos or campos[0].startswith('#'):
+                continue
+            if len(campos) != 3:
+                raise ValueError(f"Linha {linha + 1}: esperado 'u v peso', obtido {texto!r}.")
+            u, v, w = campos
+            yield (_peso(w), linha, u, v, w)
+
+
+def _grava_run(bloco, dir_temp):
+    bloco.sort()       # por peso e, no empate, pela linha de origem
+    fd, caminho = tempfile.mkstemp(suffix=".run", dir=dir_temp, text=True)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for (_, linha, u, v, w) in bloco:
+            f.write(f"{w} {linha} {u} {v}\n")
+    return caminho
+
+
+def _le_run(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        for texto in f:
+            w, linha, u, v = texto.split()
+            yield (_peso(w), int(linha), u, v, w)
+
+
+def ordena_em_blocos(entrada, tamanho_bloco=10**6, dir_temp=None):
+    """
+    Fase 1: divide o arquivo de arestas em runs ordenados de no maximo
+    `tamanho_bloco` arestas. Devolve a lista de caminhos dos runs.
+    """
+    runs = []
+    bloco = []
+    try:
+        for aresta in _le_arestas(entrada):
+            bloco.append(aresta)
+            if len(bloco) == tamanho_bloco:
+                runs.append(_grava_run(bloco, dir_temp))
+                bloco = []
+        if bloco:
+            runs.append(_grava_run(bloco, dir_temp))
+    except BaseException:
+        for caminho in runs:
+            os.remove(caminho)
+        raise
+    return runs
+
+
+def intercala(runs):
+    """Fase 2: intercalacao de k vias dos runs, como um fluxo ordenado."""
+    return heapq.merge(*(_le_run(caminho) for caminho in runs))
+
+
+def kruskal_externo(entrada, saida, tamanho_bloco=10**6, dir_temp=None, n=None):
+    """
+    Kruskal sobre o arquivo de arestas `entrada`, gravando a arvore (ou
+    floresta) geradora minima em `saida`, no mesmo formato "u v peso".
+
+    Parametros:
+        tamanho_bloco: numero maximo de arestas mantidas em memoria na fase 1.
+        dir_temp: diretorio dos runs temporarios (padrao do sistema se None).
+        n: numero de nodos, se conhecido; permite parar apos n-1 insercoes.
+
+    Devolve (numero de arestas escolhidas, custo total).
+    """
+    runs = ordena_em_blocos(entrada, tamanho_bloco, dir_temp)
+
+    # union-find: p (pai) e s (tamanho) por nodo; nodos surgem sob demanda
+    p = {}
+    s = {}
+
+    def busca(x):
+        if x not in p:
+            p[x] = x
+            s[x] = 1
+            return x
+        r = x
+        while p[r] != r:
+            r = p[r]
+        while p[x] != r:          # compressao de caminho
+            p[x], x = r, p[x]
+        return r
+
+    ins = 0
+    custo = 0
+    try:
+        with open(saida, "w", encoding="utf-8") as f:
+            for (peso, _, u, v, w) in intercala(runs):
+                if n is not None and ins == n - 1:
+                    break
+                m = busca(u)
+                k = busca(v)
+                if m == k:
+                    continue               # fecharia um ciclo
+                f.write(f"{u} {v} {w}\n")  # grava a aresta assim que ela e escolhida
+                if s[m] < s[k]:
+                    m, k = k, m
+                p[k] = m
+                s[m] += s[k]
+                ins += 1
+                custo += peso
+    finally:
+        for caminho in runs:
+            os.remove(caminho)
+
+    return ins, custo
+
+
+def _run_tests():
+    import random
+    from kruskal import kruskal
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as d:
+        for n, m in ((7, 12), (50, 40), (100, 1500)):
+            vs = [f"v{i}" for i in range(n)]
+            es = [((rng.choice(vs), rng.choice(vs)), rng.randrange(20)) for _ in range(m)]
+            entrada = os.path.join(d, "arestas.txt")
+            with open(entrada, "w", encoding="utf-8") as f:
+                f.write("# u v peso\n")
+                for ((x, y), w) in es:
+                    f.write(f"{x} {y} {w}\n")
+
+            esperado = [f"{x} {y} {w}" for ((x, y), w) in kruskal(vs, es)]
+            for bloco, nodos in ((7, None), (1000, None), (13, n)):
+                saida = os.path.join(d, "mst.txt")
+                ins, custo = kruskal_externo(entrada, saida, bloco, d, nodos)
+                with open(saida, encoding="utf-8") as f:
+                    obtido = f.read().split("\n")[:-1]
+                assert obtido == esperado
+                assert ins == len(esperado)
+                assert custo == sum(w for (_, w) in kruskal(vs, es))
+            assert sorted(os.listdir(d)) == ["arestas.txt", "mst.txt"]   # runs removidos
+
+    print("Todos os testes do Kruskal externo passaram.")
+
+
+if __name__ == "__main__":
+    _run_tests()
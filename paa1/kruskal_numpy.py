@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Kruskal vetorizado com NumPy.
+
+Variacao de `kruskal.py` para listas de arestas grandes, armazenadas em um
+vetor estruturado do NumPy com campos (u, v, w):
+
+    arestas = np.array([(0, 1, 1), (0, 6, 2), ...],
+                       dtype=[('u', np.int64), ('v', np.int64), ('w', np.int64)])
+
+Diferencas em relacao a versao simples:
+
+1. A ordenacao das arestas e feita uma unica vez com `np.argsort` estavel
+   ou, para pesos inteiros, com um radix sort LSD (um passe estavel por byte).
+2. As arestas sao processadas em blocos. Para cada bloco, as raizes dos
+   extremos sao calculadas de forma vetorizada (saltos de ponteiro sobre o
+   vetor de pais) e as arestas cujos extremos ja estao no mesmo componente
+   sao descartadas de uma so vez.
+3. Apenas as arestas sobreviventes passam pelo laco escalar de uniao.
+
+Como a ordenacao e estavel, empates sao resolvidos pela ordem de entrada,
+exatamente como em `sorted(e, key=lambda x:x[1])` de `kruskal.py`. Portanto
+a arvore devolvida e identica (mesmas arestas, na mesma ordem de insercao).
+"""
+
+import numpy as np
+
+from kruskal import kruskal
+
+
+def _ordem_radix(w):
+    """
+    Ordenacao estavel (argsort) de pesos inteiros por radix sort LSD.
+
+    A cada passe ordenamos de forma estavel por um byte da chave, do menos
+    significativo para o mais significativo. Para vetores uint8 o NumPy usa
+    ordenacao por contagem, logo cada passe custa O(m).
+
+    Custo: O(m * b), onde b e o numero de bytes necessarios para o maior peso.
+    """
+    w = np.asarray(w)
+    if not np.issubdtype(w.dtype, np.integer):
+        raise ValueError(f"Radix sort exige pesos inteiros (recebido {w.dtype}); use radix=False.")
+    if len(w) == 0:
+        return np.arange(0)
+    if not _amplitude_valida(w):
+        raise ValueError("Diferenca entre o maior e o menor peso excede 2^63 - 1; use radix=False.")
+    if np.issubdtype(w.dtype, np.unsignedinteger):
+        chave = (w - w.min()).astype(np.uint64)
+    else:
+        chave = (w.astype(np.int64) - w.min()).astype(np.uint64)   # pesos negativos viram nao negativos
+    ordem = np.arange(len(w))
+    maior = int(chave.max())
+    desloc = 0
+    while (maior >> desloc) > 0:
+        digito = ((chave[ordem] >> np.uint64(desloc)) & np.uint64(0xFF)).astype(np.uint8)
+        ordem = ordem[np.argsort(digito, kind='stable')]
+        desloc += 8
+    return ordem
+
+
+def _amplitude_valida(w):
+    # a chave w - min(w) precisa caber em int64 (calculo feito com inteiros do Python)
+    return len(w) == 0 or int(w.max()) - int(w.min()) <= np.iinfo(np.int64).max
+
+
+def _raizes(p, x):
+    """
+    Devolve as raizes dos nodos x, saltando ponteiros em paralelo.
+
+    Ao final, comprime os caminhos dos nodos consultados (p[x] = raiz).
+    """
+    r = p[x]
+    while True:
+        rr = p[r]
+        if np.array_equal(rr, r):
+            break
+        r = rr
+    p[x] = r
+    return r
+
+
+def _busca(p, x):
+    # busca escalar com compressao de caminho por divisao pela metade
+    while p[x] != x:
+        p[x] = p[p[x]]
+        x = p[x]
+    return x
+
+
+def kruskal_estruturado(arestas, n, bloco=4096, radix=None):
+    """
+    Kruskal sobre um vetor estruturado (u, v, w) com nodos 0, ..., n-1.
+
+    Parametros:
+        arestas: vetor estruturado com campos 'u', 'v' e 'w'.
+        n: numero de nodos.
+        bloco: quantidade de arestas examinadas por filtragem vetorizada.
+        radix: usa radix sort se True (ValueError se os pesos nao forem
+            inteiros ou se max(w) - min(w) nao couber em int64); se None,
+            usa radix quando isso for possivel.
+
+    Devolve os indices (em `arestas`) das arestas da arvore, na ordem em que
+    foram inseridas.
+    """
+    u = np.asarray(arestas['u'], dtype=np.int64)
+    v = np.asarray(arestas['v'], dtype=np.int64)
+    w = np.asarray(arestas['w'])
+
+    if radix is None:
+        radix = np.issubdtype(w.dtype, np.integer) and _amplitude_valida(w)
+    if radix:
+        ordem = _ordem_radix(w)
+    else:
+        ordem = np.argsort(w, kind='stable')
+
+    p = np.arange(n, dtype=np.int64)   # pai de cada nodo
+    s = np.ones(n, dtype=np.int64)     # tamanho de cada particao
+    ins = n - 1                        # numero de insercoes restantes
+    res = []
+
+    for inicio in range(0, len(ordem), bloco):
+        if ins <= 0:
+            break
+        idx = ordem[inicio:inicio + bloco]
+
+        # descarte vetorizado: extremos ja no mesmo componente
+        vivas = idx[_raizes(p, u[idx]) != _raizes(p, v[idx])]
+
+        # unioes escalares apenas para as arestas sobreviventes
+        for a in vivas.tolist():
+            m = _busca(p, u[a])
+            k = _busca(p, v[a])
+            if m == k:
+                continue       # uma uniao anterior do mesmo bloco criou ciclo
+            res.append(a)
+            if s[m] < s[k]:
+                p[m] = k
+                s[k] += s[m]
+            else:
+                p[k] = m
+                s[m] += s[k]
+            ins -= 1
+            if ins == 0:
+                break
+
+    return np.array(res, dtype=np.int64)
+
+
+def kruskal_vetorizado(v, e, bloco=4096, radix=None):
+    """
+    Mesma interface de `kruskal(v, e)`: v e a lista de nodos e e a lista de
+    arestas ((x, y), peso). Devolve a mesma lista de arestas que `kruskal`.
+    """
+    nome = {x: i for i, x in enumerate(v)}
+    tipo_w = np.int64 if all(isinstance(a[1], int) for a in e) else np.float64
+    arestas = np.empty(len(e), dtype=[('u', np.int64), ('v', np.int64), ('w', tipo_w)])
+    for i, ((x, y), peso) in enumerate(e):
+        arestas[i] = (nome[x], nome[y], peso)
+    escolhidas = kruskal_estruturado(arestas, len(v), bloco, radix)
+    return [e[i] for i in escolhidas.tolist()]
+
+
+def _run_tests():
+    from kruskal import v, e
+
+    assert kruskal_vetorizado(v, e) == kruskal(v, e)
+    assert kruskal_vetorizado(v, e, bloco=1) == kruskal(v, e)
+    assert kruskal_vetorizado(v, e, radix=False) == kruskal(v, e)
+
+    # sem arestas e com um unico nodo
+    for vs, es in ((['a', 'b'], []), (['a'], []), (['a'], [(('a', 'a'), 3)])):
+        for r in (None, False):
+            assert kruskal_vetorizado(vs, es, radix=r) == kruskal(vs, es)
+
+    # radix forcado com pesos nao inteiros, e amplitude maior que int64
+    fracionarias = np.array([(0, 1, 0.9), (1, 2, 0.1), (0, 2, 0.5)],
+                            dtype=[('u', np.int64), ('v', np.int64), ('w', np.float64)])
+    try:
+        kruskal_estruturado(fracionarias, 3, radix=True)
+        assert False, "radix=True com pesos float deveria falhar"
+    except ValueError:
+        pass
+    assert kruskal_estruturado(fracionarias, 3).tolist() == [1, 2]
+    extremos = np.array([(0, 1, np.iinfo(np.int64).min), (1, 2, np.iinfo(np.int64).max), (0, 2, 0)],
+                        dtype=[('u', np.int64), ('v', np.int64), ('w', np.int64)])
+    try:
+        _ordem_radix(extremos['w'])
+        assert False, "amplitude maior que int64 deveria falhar"
+    except ValueError:
+        pass
+    assert kruskal_estruturado(extremos, 3).tolist() == [0, 2]
+    grandes = np.array([2**64 - 1, 2**63 + 5, 2**63], dtype=np.uint64)
+    assert _ordem_radix(grandes).tolist() == [2, 1, 0]
+    pequenos = np.array([127, -128, 0], dtype=np.int8)
+    assert _ordem_radix(pequenos).tolist() == [1, 2, 0]
+
+    # pesos com muitos empates, negativos e maiores que um byte
+    rng = np.random.default_rng(0)
+    for pesos in ([-3, 0, 5], [0, 1000, 70000]):
+        n = 60
+        vs = list(range(n))
+        es = []
+        for _ in range(400):
+            x, y = rng.integers(0, n, size=2).tolist()
+            es.append(((x, y), int(rng.choice(pesos))))
+        for b in (1, 7, 4096):
+            assert kruskal_vetorizado(vs, es, bloco=b) == kruskal(vs, es)
+            assert kruskal_vetorizado(vs, es, bloco=b, radix=False) == kruskal(vs, es)
+
+    print("Todos os testes do Kruskal vetorizado passaram.")
+
+
+if __name__ == "__main__":
+    _run_tests()
+
+    import time
+    n, m = 200000, 2000000
+    rng = np.random.default_rng(1)
+    arestas = np.empty(m, dtype=[('u', np.int64), ('v', np.int64), ('w', np.int64)])
+    arestas['u'] = rng.integers(0, n, m)
+    arestas['v'] = rng.integers(0, n, m)
+    arestas['w'] = rng.integers(0, 10**6, m)
+    inicio = time.time()
+    mst = kruskal_estruturado(arestas, n)
+    print(len(mst), "arestas,", arestas['w'][mst].sum(), "custo,", time.time() - inicio, "segundos")
@@ -0,0 +1,173 @@
+# Prof. Bruno Iochins Grisci
+"""
+Vectorized preference instances for the matching benchmarks.
+
+random_instance in galeshapley.py and irving.py draws one Python list of
+name strings per participant; at n in the thousands that dominates the
+runtime. Here a whole n x n table of preference lists is one NumPy call:
+rng.permuted shuffles every row of a tiled arange independently, in place,
+so the table costs 4n^2 bytes (int32) and no temporary float keys.
+
+Bipartite instances (men/women) are returned as (m_pref, w_rank), the
+int32 matrices taken by gale_shapley_arrays in galeshapley.py:
+    m_pref[m, k] = k-th woman in man m's list
+    w_rank[w, m] = position of man m in woman w's list
+Roommates instances are a single n x (n-1) matrix pref[p, k] = k-th person
+in p's list (p itself never appears).
+
+to_name_dicts turns any of them back into the {name: [names]} format of the
+original functions, for cross-checking on small n.
+"""
+
+import numpy as np
+
+INT = np.int32
+
+
+def random_permutations(rows, n, rng):
+    """rows x n int32 matrix whose rows are independent uniform permutations of 0..n-1."""
+    table = np.tile(np.arange(n, dtype=INT), (rows, 1))
+    return rng.permuted(table, axis=1, out=table)
+
+
+def ranks(pref):
+    """Inverse permutation of each row: ranks(pref)[i, pref[i, k]] = k."""
+    rows, n = pref.shape
+    rank = np.empty((rows, n), dtype=INT)
+    np.put_along_axis(rank, pref, np.arange(n, dtype=INT)[None, :], axis=1)
+    return rank
+
+
+# ----------------------------------------------------------------------------
+# Bipartite (Gale–Shapley) families
+
+def random_bipartite(n, seed=None):
+    """Uniformly random complete preference lists on both sides."""
+    rng = np.random.default_rng(seed)
+    m_pref = random_permutations(n, n, rng)
+    w_rank = ranks(random_permutations(n, n, rng))
+    return m_pref, w_rank
+
+
+def worstish_bipartite(n):
+    """Same family as worstish_instance: identical men, every woman ranks men in reverse."""
+    m_pref = np.tile(np.arange(n, dtype=INT), (n, 1))
+    w_rank = np.tile(np.arange(n - 1, -1, -1, dtype=INT), (n, 1))
+    return m_pref, w_rank
+
+
+def easy_bipartite(n):
+    """Same family as easy_instance: man i and woman i rank each other first."""
+    i = np.arange(n, dtype=INT)[:, None]
+    k = np.arange(n, dtype=INT)[None, :]
+    m_pref = np.where(k <= i, k - 1, k).astype(INT)     # i first, then the others in order
+    m_pref[:, 0] = i[:, 0]
+    w_rank = np.where(k < i, k + 1, k).astype(INT)
+    w_rank[i[:, 0], i[:, 0]] = 0
+    return m_pref, w_rank
+
+
+BIPARTITE = {'random': random_bipartite,
+             'worstish': lambda n, seed=None: worstish_bipartite(n),
+             'easy': lambda n, seed=None: easy_bipartite(n)}
+
+
+# ----------------------------------------------------------------------------
+# Roommates (Irving) families
+
+def random_roommates(n, seed=None):
+    """Random complete lists: each row is a permutation of the n-1 other people."""
+    if n % 2 != 0:
+        raise ValueError("Stable roommates needs an even number of participants.")
+    rng = np.random.default_rng(seed)
+    pref = random_permutations(n, n - 1, rng)
+    pref += pref >= np.arange(n, dtype=INT)[:, None]    # skip oneself: 0..n-2 -> others
+    return pref
+
+
+def easy_roommates(n):
+    """Person 2j and 2j+1 rank each other first (the rest in order): stable in phase 1."""
+    if n % 2 != 0:
+        raise ValueError("Stable roommates needs an even number of participants.")
+    p = np.arange(n, dtype=INT)[:, None]
+    k = np.arange(n - 1, dtype=INT)[None, :]
+    partner = p ^ 1
+    low = np.minimum(p, partner)
+    # others in increasing order, skipping the pair {2j, 2j+1}, after the partner
+    others = k - 1 + 2 * (k - 1 >= low)
+    pref = np.where(k == 0, partner, others).astype(INT)
+    return pref
+
+
+ROOMMATES = {'random': random_roommates,
+             'easy': lambda n, seed=None: easy_roommates(n)}
+
+
+# ----------------------------------------------------------------------------
+# Conversion to the name-dict format of galeshapley.py / irving.py
+
+def to_name_dicts(m_pref, w_rank=None):
+    """
+    Bipartite (m_pref, w_rank) -> (m_prefs, w_prefs) with names M1.., W1..
+    Roommates pref -> prefs with names P1..
+    """
+    if w_rank is None:
+        return {f"P{p + 1}": [f"P{q + 1}" for q in row] for p, row in enumerate(m_pref.tolist())}
+    w_pref = np.argsort(w_rank, axis=1)
+    m_prefs = {f"M{m + 1}": [f"W{w + 1}" for w in row] for m, row in enumerate(m_pref.tolist())}
+    w_prefs = {f"W{w + 1}": [f"M{m + 1}" for m in row] for w, row in enumerate(w_pref.tolist())}
+    return m_prefs, w_prefs
+
+
+def _check():
+    from galeshapley import easy_instance, gale_shapley, gale_shapley_arrays, worstish_instance
+    from irving import _is_stable, _normalize, irving
+
+    for n in (1, 2, 5, 40):
+        assert to_name_dicts(*worstish_bipartite(n)) == worstish_instance(n)
+        assert to_name_dicts(*easy_bipartite(n)) == easy_instance(n)
+
+        m_pref, w_rank = random_bipartite(n, seed=n)
+        assert (np.sort(m_pref, axis=1) == np.arange(n)).all()
+        assert (np.sort(w_rank, axis=1) == np.arange(n)).all()
+        husband, i_loop = gale_shapley_arrays(m_pref, np.full(n, n, dtype=INT), w_rank)
+        pairs, j_loop = gale_shapley(*to_name_dicts(m_pref, w_rank))
+        assert i_loop == j_loop
+        assert pairs == {(f"M{m + 1}", f"W{w + 1}") for w, m in enumerate(husband.tolist())}
+
+    for n in (2, 4, 10, 30):
+        for make in (random_roommates, easy_roommates):
+            pref = make(n)
+            assert (np.sort(pref, axis=1) ==
+                    [[q for q in range(n) if q != p] for p in range(n)]).all()
+            prefs = to_name_dicts(pref)
+            matching, _ = irving(prefs)
+            if make is easy_roommates:
+                assert _normalize(matching) == {frozenset((f"P{p + 1}", f"P{p + 2}")) for p in range(0, n, 2)}
+            if matching is not None:
+                assert _is_stable(prefs, matching)
+
+    print("All instance generator checks passed.")
+
+
+if __name__ == '__main__':
+    import time
+
+    _check()
+    n = 10**4
+    for name, make in BIPARTITE.items():
+        start = time.perf_counter()
+        make(n, 0)
+        print(f"{name:9s} bipartite  n={n}: {time.perf_counter() - start:.2f} s")
+    start = time.perf_counter()
+    random_roommates(n, 0)
+    print(f"random    roommates  n={n}: {time.perf_counter() - start:.2f} s")
+
+    from galeshapley import random_instance
+    n = 2000
+    start = time.perf_counter()
+    random_instance(n, 0)
+    print(f"galeshapley.random_instance n={n}: {time.perf_counter() - start:.2f} s")
+    start = time.perf_counter()
+    random_bipartite(n, 0)
+    print(f"random_bipartite            n={n}: {time.perf_counter() - start:.2f} s")
@@ -0,0 +1,212 @@
+# Prof. Bruno Iochins Grisci
+"""
+Vectorized blocking-pair detection for large matchings.
+
+_is_stable in irving.py walks every preference list in Python, and there is
+no checker for gale_shapley outputs at all. Here stability is checked on rank
+matrices with NumPy, one block of rows at a time:
+
+Bipartite (men/women):
+    (m, w) blocks  <=>  m_rank[m, w] < m_rank[m, wife[m]]
+                        and w_rank[w, m] < w_rank[w, husband[w]]
+Roommates:
+    (p, q) blocks  <=>  rank[p, q] < rank[p, mate[p]]
+                        and rank[q, p] < rank[q, mate[q]]
+
+Each side becomes a boolean matrix "prefers this candidate to the current
+partner" (a row-wise comparison against the partner's rank), and the
+blocking pairs are the positions where both matrices agree (one of them
+transposed). An unmatched person (partner -1) prefers every acceptable
+candidate. Unacceptable candidates have rank >= the list length and never
+block. Rows are processed in blocks so the temporary boolean matrices take
+block x n bytes.
+"""
+
+import numpy as np
+
+from matching_instances import ranks
+
+
+def _thresholds(rank, partner, unacceptable):
+    """Rank of each person's partner, or `unacceptable` when unmatched."""
+    partner = np.asarray(partner)
+    rows = np.arange(rank.shape[0])
+    thr = np.full(rank.shape[0], unacceptable, dtype=np.int64)
+    matched = partner >= 0
+    thr[matched] = rank[rows[matched], partner[matched]]
+    return thr
+
+
+def blocking_pairs_bipartite(m_rank, w_rank, wife, block=1024):
+    """
+    m_rank[m, w], w_rank[w, m]: rank matrices (lower is better; >= list length
+    means unacceptable). wife[m]: woman matched to m, or -1.
+    returns: int array of shape (k, 2) with the blocking pairs (m, w).
+    """
+    m_rank = np.asarray(m_rank)
+    w_rank = np.asarray(w_rank)
+    wife = np.asarray(wife)
+    n_m, n_w = m_rank.shape
+    husband = np.full(n_w, -1, dtype=np.int64)
+    matched = wife >= 0
+    husband[wife[matched]] = np.nonzero(matched)[0]
+
+    m_thr = _thresholds(m_rank, wife, n_w)
+    w_thr = _thresholds(w_rank, husband, n_m)
+    found = []
+    for i in range(0, n_m, block):
+        j = min(i + block, n_m)
+        m_wants = m_rank[i:j] < m_thr[i:j, None]                 # m prefers w to wife[m]
+        w_wants = (w_rank[:, i:j] < w_thr[:, None]).T           # w prefers m to husband[w]
+        m, w = np.nonzero(m_wants & w_wants)
+        found.append(np.stack((m + i, w), axis=1))
+    return np.concatenate(found) if found else np.empty((0, 2), dtype=np.int64)
+
+
+def blocking_pairs_roommates(rank, mate, block=1024):
+    """
+    rank[p, q]: position of q in p's list (rank[p, p] and unacceptable >= n - 1).
+    mate[p]: partner of p, or -1.
+    returns: int array of shape (k, 2) with the blocking pairs (p, q), p < q.
+    """
+    rank = np.asarray(rank)
+    n = rank.shape[0]
+    thr = _thresholds(rank, mate, n - 1)
+    found = []
+    for i in range(0, n, block):
+        j = min(i + block, n)
+        p_wants = rank[i:j] < thr[i:j, None]                    # p prefers q to mate[p]
+        q_wants = (rank[:, i:j] < thr[:, None]).T               # q prefers p to mate[q]
+        both = p_wants & q_wants
+        both &= np.arange(n)[None, :] > np.arange(i, j)[:, None]  # each pair once
+        p, q = np.nonzero(both)
+        found.append(np.stack((p + i, q), axis=1))
+    return np.concatenate(found) if found else np.empty((0, 2), dtype=np.int64)
+
+
+def roommates_rank(pref):
+    """rank matrix (n x n) from an n x (n-1) preference matrix; rank[p, p] = n - 1."""
+    n = pref.shape[0]
+    full = np.concatenate((pref, np.arange(n, dtype=pref.dtype)[:, None]), axis=1)
+    return ranks(full)
+
+
+# ----------------------------------------------------------------------------
+# Name-level wrappers for the outputs of gale_shapley and irving
+
+def blocking_pairs_gale_shapley(m_prefs, w_prefs, pairs):
+    """Blocking (man, woman) pairs of a set of (man, woman) pairs."""
+    from galeshapley import to_arrays
+
+    men, women, m_pref, _, w_rank = to_arrays(m_prefs, w_prefs)
+    n_m, n_w = m_pref.shape
+    m_rank = np.full((n_m, n_w), n_w, dtype=np.int32)          # n_w = unacceptable
+    rows, cols = np.nonzero(m_pref >= 0)                          # skip the -1 padding
+    m_rank[rows, m_pref[rows, cols]] = cols
+
+    m_id = {m: i for i, m in enumerate(men)}
+    w_id = {w: i for i, w in enumerate(women)}
+    wife = np.full(n_m, -1, dtype=np.int64)
+    for m, w in pairs:
+        wife[m_id[m]] = w_id[w]
+    return {(men[m], women[w]) for m, w in blocking_pairs_bipartite(m_rank, w_rank, wife).tolist()}
+
+
+def blocking_pairs_irving(preferences, matching):
+    """Blocking pairs (as frozensets of names) of an irving matching."""
+    names = list(preferences.keys())
+    idx = {p: i for i, p in enumerate(names)}
+    pref = np.array([[idx[q] for q in preferences[p]] for p in names], dtype=np.int32)
+    mate = np.full(len(names), -1, dtype=np.int64)
+    for a, b in matching:
+        mate[idx[a]] = idx[b]
+        mate[idx[b]] = idx[a]
+    return {frozenset((names[p], names[q]))
+            for p, q in blocking_pairs_roommates(roommates_rank(pref), mate).tolist()}
+
+
+def _check():
+    import itertools
+    import random
+
+    import irving as irving_module
+    from galeshapley import gale_shapley, gale_shapley_arrays, random_instance
+    from irving import _is_stable, irving, irving_arrays
+    from matching_instances import random_bipartite, random_roommates
+
+    rng = random.Random(0)
+
+    # bipartite: Gale–Shapley outputs are stable; random perfect matchings are
+    # compared with a brute-force search for blocking pairs
+    for n in (1, 3, 8, 30):
+        m_prefs, w_prefs = random_instance(n, seed=n)
+        pairs, _ = gale_shapley(m_prefs, w_prefs)
+        assert blocking_pairs_gale_shapley(m_prefs, w_prefs, pairs) == set()
+
+        men, women = list(m_prefs), list(w_prefs)
+        shuffled = women[:]
+        rng.shuffle(shuffled)
+        pairs = set(zip(men, shuffled))
+        wife = dict(pairs)
+        husband = {w: m for m, w in pairs}
+        brute = {(m, w) for m, w in itertools.product(men, women)
+                 if m_prefs[m].index(w) < m_prefs[m].index(wife[m])
+                 and w_prefs[w].index(m) < w_prefs[w].index(husband[w])}
+        assert blocking_pairs_gale_shapley(m_prefs, w_prefs, pairs) == brute
+
+    # incomplete lists and unmatched people
+    m_prefs = {'a': ['X'], 'b': ['X', 'Y']}
+    w_prefs = {'X': ['b', 'a'], 'Y': ['b']}
+    assert blocking_pairs_gale_shapley(m_prefs, w_prefs, {('a', 'X')}) == {('b', 'X'), ('b', 'Y')}
+    assert blocking_pairs_gale_shapley(m_prefs, w_prefs, gale_shapley(m_prefs, w_prefs)[0]) == set()
+
+    # roommates: agrees with _is_stable on irving outputs and on random matchings
+    for n in (2, 4, 6, 10, 20):
+        for seed in range(20):
+            prefs = irving_module.random_instance(n, seed=seed)
+            matching, _ = irving(prefs)
+            if matching is not None:
+                assert blocking_pairs_irving(prefs, matching) == set()
+            names = list(prefs)
+            rng.shuffle(names)
+            matching = {(names[i], names[i + 1]) for i in range(0, n, 2)}
+            assert (blocking_pairs_irving(prefs, matching) == set()) == _is_stable(prefs, matching)
+
+    # array engines, larger n and several block sizes
+    n = 400
+    m_pref, w_rank = random_bipartite(n, seed=1)
+    husband, _ = gale_shapley_arrays(m_pref, np.full(n, n, dtype=np.int32), w_rank)
+    wife = np.empty(n, dtype=np.int64)
+    wife[husband] = np.arange(n)
+    m_rank = ranks(m_pref)
+    for block in (1, 7, 1024):
+        assert len(blocking_pairs_bipartite(m_rank, w_rank, wife, block)) == 0
+    wife_bad = np.roll(wife, 1)
+    sizes = {len(blocking_pairs_bipartite(m_rank, w_rank, wife_bad, b)) for b in (1, 7, 1024)}
+    assert len(sizes) == 1 and sizes.pop() > 0
+
+    pref = random_roommates(200, seed=3)
+    mate, _ = irving_arrays(pref)
+    if mate is not None:
+        assert len(blocking_pairs_roommates(roommates_rank(pref), mate, 13)) == 0
+
+    print("All stability checks passed.")
+
+
+if __name__ == '__main__':
+    import time
+
+    from galeshapley import gale_shapley_arrays
+    from matching_instances import random_bipartite
+
+    _check()
+
+    n = 5000
+    m_pref, w_rank = random_bipartite(n, seed=0)
+    husband, _ = gale_shapley_arrays(m_pref, np.full(n, n, dtype=np.int32), w_rank)
+    wife = np.empty(n, dtype=np.int64)
+    wife[husband] = np.arange(n)
+    m_rank = ranks(m_pref)
+    start = time.perf_counter()
+    found = blocking_pairs_bipartite(m_rank, w_rank, wife)
+    print(f"bipartite n={n}: {len(found)} blocking pairs, {time.perf_counter() - start:.2f} s")
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Arvore geradora minima dinamica sob insercao de arestas.
+
+Em vez de executar `kruskal(v, e)` de novo sobre o grafo inteiro a cada
+aresta nova, mantemos a arvore (floresta) atual e usamos a propriedade do
+ciclo: ao inserir a aresta (x, y) de peso w,
+
+- se x e y estao em componentes diferentes, a aresta entra na arvore;
+- senao, ela fecha um ciclo com o caminho de x a y na arvore. Se a aresta
+  mais pesada desse caminho pesa mais que w, ela sai e a nova entra; caso
+  contrario, a arvore nao muda.
+
+O caminho x-y e consultado em uma link-cut tree (Sleator e Tarjan), que
+permite ligar, cortar e obter o maximo de um caminho em O(log n) amortizado.
+Cada aresta da arvore e representada por um nodo proprio da link-cut tree,
+ligado aos seus dois extremos e com valor igual ao peso; os nodos dos
+vertices tem valor -infinito. Assim o maximo do caminho e sempre uma aresta.
+
+Uso:
+
+    t = ArvoreGeradoraDinamica(['a', 'b', 'c'])
+    t.insere('a', 'b', 3)
+    t.insere('b', 'c', 1)
+    t.insere('a', 'c', 2)   # remove ('a', 'b') de peso 3
+    t.peso_total            # 3
+    t.arestas()             # [(('b', 'c'), 1), (('a', 'c'), 2)]
+"""
+
+import math
+
+
+class ArvoreGeradoraDinamica:
+
+    def __init__(self, v=()):
+        # link-cut tree em vetores paralelos (um indice por nodo)
+        self.esq = []     # filho esquerdo na splay tree
+        self.dir = []     # filho direito na splay tree
+        self.pai = []     # pai na splay tree ou pai de caminho
+        self.inv = []     # marca de inversao pendente (para tornar raiz)
+        self.val = []     # peso do nodo (-inf para vertices)
+        self.mx = []      # nodo de maior valor na subarvore da splay tree
+
+        self.indice = {}  # vertice -> nodo
+        self.livres = []  # nodos de arestas removidas, para reuso
+        self.aresta = {}  # nodo de aresta -> ((x, y), peso)
+        self.peso_total = 0
+
+        for x in v:
+            self._vertice(x)
+
+    # ------------------------------------------------------------------
+    # operacoes internas da link-cut tree
+
+    def _novo(self, valor):
+        if self.livres:
+            i = self.livres.pop()
+            self.esq[i] = self.dir[i] = self.pai[i] = -1
+            self.inv[i] = False
+            self.val[i] = valor
+            self.mx[i] = i
+            return i
+        self.esq.append(-1)
+        self.dir.append(-1)
+        self.pai.append(-1)
+        self.inv.append(False)
+        self.val.append(valor)
+        self.mx.append(len(self.val) - 1)
+        return len(self.val) - 1
+
+    def _vertice(self, x):
+        if x not in self.indice:
+            self.indice[x] = self._novo(-math.inf)
+        return self.indice[x]
+
+    def _eh_raiz(self, x):
+        # x e raiz da sua splay tree se nao e filho do seu pai
+        p = self.pai[x]
+        return p == -1 or (self.esq[p] != x and self.dir[p] != x)
+
+    def _atualiza(self, x):
+        m = x
+        for f in (self.esq[x], self.dir[x]):
+            if f != -1 and self.val[self.mx[f]] > self.val[m]:
+                m = self.mx[f]
+        self.mx[x] = m
+
+    def _empurra(self, x):
+        if self.inv[x]:
+            self.esq[x], self.dir[x] = self.dir[x], self.esq[x]
+            for f in (self.esq[x], self.dir[x]):
+                if f != -1:
+                    self.inv[f] = not self.inv[f]
+            self.inv[x] = False
+
+    def _rotaciona(self, x):
+        p = self.pai[x]
+        g = self.pai[p]
+        if not self._eh_raiz(p):
+            if self.esq[g] == p:
+                self.esq[g] = x
+            else:
+                self.dir[g] = x
+        self.pai[x] = g
+        if self.esq[p] == x:
+            b = self.dir[x]
+            self.esq[p] = b
+            self.dir[x] = p
+        else:
+            b = self.esq[x]
+            self.dir[p] = b
+            self.esq[x] = p
+        if b != -1:
+            self.pai[b] = p
+        self.pai[p] = x
+        self._atualiza(p)
+        self._atualiza(x)
+
+    def _splay(self, x):
+        # aplica as inversoes pendentes do topo da splay tree ate x
+        pilha = [x]
+        y = x
+        while not self._eh_raiz(y):
+            y = self.pai[y]
+            pilha.append(y)
+        while pilha:
+            self._empurra(pilha.pop())
+
+        while not self._eh_raiz(x):
+            p = self.pai[x]
+            if not self._eh_raiz(p):
+                g = self.pai[p]
+                if (self.esq[g] == p) == (self.esq[p] == x):
+                    self._rotaciona(p)     # zig-zig
+                else:
+                    self._rotaciona(x)     # zig-zag
+            self._rotaciona(x)
+
+    def _acessa(self, x):
+        # torna preferido o caminho da raiz ate x; x vira raiz da sua splay tree
+        ultimo = -1
+        y = x
+        while y != -1:
+            self._splay(y)
+            self.dir[y] = ultimo
+            self._atualiza(y)
+            ultimo = y
+            y = self.pai[y]
+        self._splay(x)
+
+    def _torna_raiz(self, x):
+        self._acessa(x)
+        self.inv[x] = not self.inv[x]
+
+    def _raiz(self, x):
+        self._acessa(x)
+        while True:
+            self._empurra(x)
+            if self.esq[x] == -1:
+                break
+            x = self.esq[x]
+        self._splay(x)
+        return x
+
+    def _liga(self, x, y):
+        self._torna_raiz(x)
+        self.pai[x] = y
+
+    def _corta(self, x, y):
+        # pressupoe a aresta x-y na arvore representada
+        self._torna_raiz(x)
+        self._acessa(y)
+        self.esq[y] = -1
+        self.pai[x] = -1
+        self._atualiza(y)
+
+    def _maximo_caminho(self, x, y):
+        self._torna_raiz(x)
+        self._acessa(y)
+        return self.mx[y]
+
+    # ------------------------------------------------------------------
+    # interface publica
+
+    def conectados(self, x, y):
+        """Indica se x e y estao no mesmo componente da floresta atual."""
+        if x not in self.indice or y not in self.indice:
+            return x == y
+        return self._raiz(self.indice[x]) == self._raiz(self.indice[y])
+
+    def insere(self, x, y, peso):
+        """
+        Insere a aresta (x, y) com o peso dado, em O(log n) amortizado.
+
+        Devolve a aresta ((x', y'), peso') que saiu da arvore, a propria aresta
+        inserida se ela nao entrou, ou None se entrou sem remover nenhuma.
+        """
+        i = self._vertice(x)
+        j = self._vertice(y)
+        if i == j:
+            return ((x, y), peso)                  # laco nunca entra
+
+        removida = None
+        self._torna_raiz(i)
+        if self._raiz(j) == i:                     # x e y ja conectados
+            e = self._maximo_caminho(i, j)
+            if self.val[e] <= peso:
+                return ((x, y), peso)              # a nova aresta e a mais pesada do ciclo
+            removida = self.aresta.pop(e)
+            (a, b), w = removida
+            self._corta(self.indice[a], e)
+            self._corta(e, self.indice[b])
+            self.livres.append(e)
+            self.peso_total -= w
+
+        e = self._novo(peso)
+        self.aresta[e] = ((x, y), peso)
+        self._liga(i, e)
+        self._liga(e, j)
+        self.peso_total += peso
+        return removida
+
+    def arestas(self):
+        """Arestas da arvore (floresta) geradora minima atual."""
+        return list(self.aresta.values())
+
+    def __len__(self):
+        return len(self.aresta)
+
+
+def _run_tests():
+    import random
+    from kruskal import kruskal, v, e
+
+    t = ArvoreGeradoraDinamica(v)
+    for ((x, y), w) in e:
+        t.insere(x, y, w)
+    assert t.peso_total == sum(w for (_, w) in kruskal(v, e))
+    assert len(t) == len(v) - 1
+
+    # exemplo do topo do arquivo
+    t = ArvoreGeradoraDinamica(['a', 'b', 'c'])
+    assert t.insere('a', 'b', 3) is None
+    assert t.insere('b', 'c', 1) is None
+    assert t.insere('a', 'c', 2) == (('a', 'b'), 3)
+    assert t.peso_total == 3
+    assert sorted(t.arestas()) == [(('a', 'c'), 2), (('b', 'c'), 1)]
+
+    # pesos distintos: a cada passo a floresta e exatamente a de Kruskal
+    rng = random.Random(0)
+    n, m = 60, 800
+    pesos = rng.sample(range(10 * m), m)
+    t = ArvoreGeradoraDinamica(range(n))
+    es = []
+    for i in range(m):
+        x, y = rng.randrange(n), rng.randrange(n)
+        es.append(((x, y), pesos[i]))
+        t.insere(x, y, pesos[i])
+        if i % 37 == 0 or i == m - 1:
+            k = kruskal(list(range(n)), es)
+            assert sorted(t.arestas()) == sorted(k)
+            assert t.peso_total == sum(w for (_, w) in k)
+            assert t.conectados(x, y)
+
+    print("Todos os testes da arvore geradora minima dinamica passaram.")
+
+
+if __name__ == "__main__":
+    _run_tests()
+
+    import random
+    import time
+    n, m = 10**4, 10**5
+    t = ArvoreGeradoraDinamica(range(n))
+    inicio = time.time()
+    for _ in range(m):
+        t.insere(random.randrange(n), random.randrange(n), random.random())
+    print(m, "insercoes em", time.time() - inicio, "segundos; peso total", t.peso_total)
@@ -161,6 +161,17 @@ def quick_sort(array, inicio, fim):
         quick_sort(array, pivo_idx + 1, fim)
 
 
+# quick_sort (e quick_sort_2) chegam a profundidade n em vetores ordenados:
+# executa com o limite de recursão aumentado, restaurando-o ao final
+def com_limite_de_recursao(funcao, *args, limite=50000):
+    anterior = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(anterior, limite))
+    try:
+        return funcao(*args)
+    finally:
+        sys.setrecursionlimit(anterior)
+
+
 def partition(array, inicio, fim):
     pivo = array[fim]
     menores_idx = inicio - 1
@@ -190,11 +201,250 @@ def quick_sort_2(array):
     return menores + [pivo] + maiores
 
 
-def benchmark(quantidade_vetores=5, executar_lentos=False):
-	# Aumentar limite de recursão
-	sys.setrecursionlimit(50000)
+##########################################################################
+
+# INTROSORT (quicksort com partição em 3 vias)
+#
+# - pivô: mediana de três (ou "ninther", mediana de três medianas, em
+#   intervalos grandes), o que evita o pior caso em vetores ordenados;
+# - partição de Dijkstra (bandeira holandesa) em menores, iguais e maiores
+#   que o pivô: os iguais já ficam na posição final, então vetores com
+#   muitas repetições não degradam;
+# - recursão só no lado menor e laço no maior: profundidade <= log2(n),
+#   sem precisar de sys.setrecursionlimit;
+# - limite de 2*log2(n) partições: se for atingido, o intervalo é ordenado
+#   com heapsort, garantindo O(n log n) no pior caso;
+# - intervalos pequenos são ordenados com insertion sort.
+
+LIMIAR_INSERTION = 16
+LIMIAR_NINTHER = 40
+
+
+def intro_sort(array):
+    # Aceita listas ou qualquer buffer gravável (ver versões para buffers)
+    v = array if isinstance(array, list) else _visao(array)
+    n = len(v)
+    if n > 1:
+        _intro_sort(v, 0, n - 1, 2 * n.bit_length())
+
+
+def _intro_sort(v, inicio, fim, profundidade):
+    while fim - inicio + 1 > LIMIAR_INSERTION:
+        if profundidade == 0:
+            heap_sort(v, inicio, fim)
+            return
+        profundidade -= 1
+        menores_fim, maiores_inicio = _partition_3_vias(v, inicio, fim, _escolhe_pivo(v, inicio, fim))
+        # Recursão no lado menor, laço no maior
+        if menores_fim - inicio < fim - maiores_inicio:
+            _intro_sort(v, inicio, menores_fim, profundidade)
+            inicio = maiores_inicio
+        else:
+            _intro_sort(v, maiores_inicio, fim, profundidade)
+            fim = menores_fim
+    _insertion_sort_intervalo(v, inicio, fim)
+
+
+def _mediana_de_tres(v, a, b, c):
+    x, y, z = v[a], v[b], v[c]
+    if x < y:
+        if y < z:
+            return y
+        return z if x < z else x
+    if x < z:
+        return x
+    return z if y < z else y
+
+
+def _escolhe_pivo(v, inicio, fim):
+    meio = (inicio + fim) // 2
+    if fim - inicio + 1 < LIMIAR_NINTHER:
+        return _mediana_de_tres(v, inicio, meio, fim)
+    passo = (fim - inicio + 1) // 8
+    return sorted((
+        _mediana_de_tres(v, inicio, inicio + passo, inicio + 2 * passo),
+        _mediana_de_tres(v, meio - passo, meio, meio + passo),
+        _mediana_de_tres(v, fim - 2 * passo, fim - passo, fim),
+    ))[1]
+
+
+def _partition_3_vias(v, inicio, fim, pivo):
+    # Ao final: v[inicio..menores-1] < pivo, v[menores..maiores] == pivo,
+    # v[maiores+1..fim] > pivo. Devolve os limites dos lados a ordenar.
+    menores = inicio
+    atual = inicio
+    maiores = fim
+    while atual <= maiores:
+        x = v[atual]
+        if x < pivo:
+            v[atual] = v[menores]
+            v[menores] = x
+            menores += 1
+            atual += 1
+        elif x > pivo:
+            v[atual] = v[maiores]
+            v[maiores] = x
+            maiores -= 1
+        else:
+            atual += 1
+    return menores - 1, maiores + 1
+
+
+def _insertion_sort_intervalo(v, inicio, fim):
+    for atual in range(inicio + 1, fim + 1):
+        chave = v[atual]
+        anterior = atual - 1
+        while anterior >= inicio and v[anterior] > chave:
+            v[anterior + 1] = v[anterior]
+            anterior -= 1
+        v[anterior + 1] = chave
+
+
+def heap_sort(v, inicio, fim):
+    # Heap de máximo sobre v[inicio..fim] (filhos de i: 2i+1 e 2i+2, relativos a inicio)
+    n = fim - inicio + 1
+    for i in range(n // 2 - 1, -1, -1):
+        _desce(v, inicio, i, n)
+    for ultimo in range(n - 1, 0, -1):
+        v[inicio], v[inicio + ultimo] = v[inicio + ultimo], v[inicio]
+        _desce(v, inicio, 0, ultimo)
+
+
+def _desce(v, inicio, i, n):
+    x = v[inicio + i]
+    filho = 2 * i + 1
+    while filho < n:
+        if filho + 1 < n and v[inicio + filho + 1] > v[inicio + filho]:
+            filho += 1
+        if v[inicio + filho] <= x:
+            break
+        v[inicio + i] = v[inicio + filho]
+        i = filho
+        filho = 2 * i + 1
+    v[inicio + i] = x
+
+
+##########################################################################
+
+# VERSÕES PARA BUFFERS TIPADOS (array.array, NumPy, bytearray...)
+#
+# As funções abaixo recebem qualquer objeto que implemente o protocolo de
+# buffer (array('i'), np.ndarray 1-D, bytearray...) e ordenam os dados no
+# próprio buffer, acessando-o por um memoryview: os valores continuam
+# armazenados como inteiros de máquina, sem uma lista de objetos int.
+# Elas não imprimem os passos intermediários (ignoram a variável debug).
+# Visões com passo (ex.: v[::2] do NumPy) são aceitas. Buffers com ordem de
+# bytes diferente da nativa (ex.: dtype('>i4')) não são: o memoryview não
+# indexa esses formatos (NotImplementedError) e memoryview.cast os recusa
+# (ValueError).
+
+
+def _visao(buffer):
+    visao = memoryview(buffer)
+    if visao.ndim != 1:
+        raise ValueError("O buffer deve ser unidimensional.")
+    if visao.readonly:
+        raise TypeError("O buffer deve ser gravável.")
+    return visao
+
+
+def insertion_sort_buffer(buffer):
+    v = _visao(buffer)
+    for atual in range(1, len(v)):
+        chave = v[atual]
+        anterior = atual - 1
+        while anterior >= 0 and v[anterior] > chave:
+            v[anterior + 1] = v[anterior]
+            anterior -= 1
+        v[anterior + 1] = chave
+
+
+def selection_sort_buffer(buffer):
+    v = _visao(buffer)
+    n = len(v)
+    for i in range(0, n):
+        min_idx = i
+        minimo = v[i]
+        for j in range(i + 1, n):
+            if v[j] < minimo:
+                min_idx = j
+                minimo = v[j]
+        v[min_idx] = v[i]
+        v[i] = minimo
+
+
+def bubble_sort_buffer(buffer):
+    v = _visao(buffer)
+    n = len(v)
+    for i in range(0, n - 1):
+        for j in range(0, n - 1 - i):
+            if v[j] > v[j + 1]:
+                v[j], v[j + 1] = v[j + 1], v[j]
+
+
+def merge_sort_buffer(buffer):
+    # Versão iterativa (bottom-up): intercala blocos de tamanho 1, 2, 4, ...
+    # alternando entre o buffer e um auxiliar do mesmo tipo
+    v = _visao(buffer)
+    n = len(v)
+    origem = v
+    destino = memoryview(bytearray(v.tobytes())).cast(v.format)
+    largura = 1
+    while largura < n:
+        for inicio in range(0, n, 2 * largura):
+            meio = min(inicio + largura, n)
+            fim = min(inicio + 2 * largura, n)
+            esquerda, direita, atual = inicio, meio, inicio
+            while esquerda < meio and direita < fim:
+                if origem[esquerda] <= origem[direita]:
+                    destino[atual] = origem[esquerda]
+                    esquerda += 1
+                else:
+                    destino[atual] = origem[direita]
+                    direita += 1
+                atual += 1
+            # Copiar os restantes (fatias de memoryview não criam objetos int)
+            destino[atual:atual + meio - esquerda] = origem[esquerda:meio]
+            atual += meio - esquerda
+            destino[atual:atual + fim - direita] = origem[direita:fim]
+        origem, destino = destino, origem
+        largura *= 2
+    if origem is not v:
+        v[:] = origem
+
+
+def quick_sort_buffer(buffer):
+    v = _visao(buffer)
+    _quick_sort_visao(v, 0, len(v) - 1)
+
+
+def _quick_sort_visao(v, inicio, fim):
+    # Mesmo pivô (último elemento) de quick_sort, mas com recursão só no lado
+    # menor e laço no maior: profundidade <= log2(n) mesmo em vetores ordenados
+    while inicio < fim:
+        pivo_idx = _partition_visao(v, inicio, fim)
+        if pivo_idx - inicio < fim - pivo_idx:
+            _quick_sort_visao(v, inicio, pivo_idx - 1)
+            inicio = pivo_idx + 1
+        else:
+            _quick_sort_visao(v, pivo_idx + 1, fim)
+            fim = pivo_idx - 1
+
 
+def _partition_visao(v, inicio, fim):
+    pivo = v[fim]
+    menores_idx = inicio - 1
+    for atual in range(inicio, fim):
+        if v[atual] <= pivo:
+            menores_idx += 1
+            v[menores_idx], v[atual] = v[atual], v[menores_idx]
+    v[menores_idx + 1], v[fim] = v[fim], v[menores_idx + 1]
+    return menores_idx + 1
+
+
+def benchmark(quantidade_vetores=5, executar_lentos=False):
 	print("\n--- Teste de Desempenho ---")
+	global debug
 	debug = False
 
 	# Usaremos os valores exatos modificados pelo usuário
@@ -202,7 +452,7 @@ def benchmark(quantidade_vetores=5, executar_lentos=False):
 	ns_lentos = [1000, 2000, 5000, 10000, 25000] # O(n^2)
 
 	algoritmos_lentos = ['Insertion', 'Selection', 'Bubble'] if executar_lentos else []
-	algoritmos_rapidos = ['Merge\n(Imperat.)', 'Merge\n(Funcional)', 'Quick\n(Imperat.)', 'Quick\n(Funcional)']
+	algoritmos_rapidos = ['Merge\n(Imperat.)', 'Merge\n(Funcional)', 'Quick\n(Imperat.)', 'Quick\n(Funcional)', 'Introsort']
 
 	tempos_medias = {alg: [] for alg in algoritmos_lentos + algoritmos_rapidos}
 	tempos_desvios = {alg: [] for alg in algoritmos_lentos + algoritmos_rapidos}
@@ -234,14 +484,20 @@ def benchmark(quantidade_vetores=5, executar_lentos=False):
 			# Quick Sort (Imperativo)
 			V = vetor_aleatorio.copy()
 			inicio = time.time()
-			quick_sort(V, 0, len(V) - 1)
+			com_limite_de_recursao(quick_sort, V, 0, len(V) - 1)
 			resultados_rodadas['Quick\n(Imperat.)'].append(time.time() - inicio)
 
 			# Quick Sort (Funcional)
 			V = vetor_aleatorio.copy()
 			inicio = time.time()
-			quick_sort_2(V)
+			com_limite_de_recursao(quick_sort_2, V)
 			resultados_rodadas['Quick\n(Funcional)'].append(time.time() - inicio)
+
+			# Introsort
+			V = vetor_aleatorio.copy()
+			inicio = time.time()
+			intro_sort(V)
+			resultados_rodadas['Introsort'].append(time.time() - inicio)
 			
 			# Algoritmos O(N^2)
 			if n in ns_lentos and executar_lentos:
@@ -282,7 +538,8 @@ def benchmark(quantidade_vetores=5, executar_lentos=False):
 
 	cores = {'Insertion': 'red', 'Selection': 'orange', 'Bubble': 'gold', 
 			 'Merge\n(Imperat.)': 'lightgreen', 'Merge\n(Funcional)': 'green', 
-			 'Quick\n(Imperat.)': 'lightblue', 'Quick\n(Funcional)': 'blue'}
+			 'Quick\n(Imperat.)': 'lightblue', 'Quick\n(Funcional)': 'blue',
+			 'Introsort': 'purple'}
 	
 	if executar_lentos:
 		for alg in algoritmos_lentos:
@@ -302,6 +559,81 @@ def benchmark(quantidade_vetores=5, executar_lentos=False):
 	plt.show()
 
 
+def benchmark_buffers(quantidade_vetores=5, ns=(1000, 5000, 10000, 25000, 50000), executar_lentos=False, mostrar_grafico=True):
+	# Compara as versões para listas, as versões para buffers (array('i') e
+	# NumPy int32) e as ordenações nativas list.sort e np.sort
+	from array import array
+
+	global debug
+	debug = False
+
+	print("\n--- Teste de Desempenho (buffers tipados) ---")
+
+	def lista(vetor, funcao):
+		V = list(vetor)
+		inicio = time.perf_counter()
+		funcao(V)
+		return time.perf_counter() - inicio
+
+	def buffer_array(vetor, funcao):
+		V = array('i', vetor)
+		inicio = time.perf_counter()
+		funcao(V)
+		return time.perf_counter() - inicio
+
+	def buffer_numpy(vetor, funcao):
+		V = np.array(vetor, dtype=np.int32)
+		inicio = time.perf_counter()
+		funcao(V)
+		return time.perf_counter() - inicio
+
+	algoritmos = {
+		'Merge (lista)': lambda vetor: lista(vetor, lambda V: merge_sort(V, V.copy(), 0, len(V) - 1)),
+		'Merge (array)': lambda vetor: buffer_array(vetor, merge_sort_buffer),
+		'Merge (NumPy)': lambda vetor: buffer_numpy(vetor, merge_sort_buffer),
+		'Quick (lista)': lambda vetor: lista(vetor, lambda V: com_limite_de_recursao(quick_sort, V, 0, len(V) - 1)),
+		'Quick (array)': lambda vetor: buffer_array(vetor, quick_sort_buffer),
+		'Quick (NumPy)': lambda vetor: buffer_numpy(vetor, quick_sort_buffer),
+		'Intro (lista)': lambda vetor: lista(vetor, intro_sort),
+		'Intro (array)': lambda vetor: buffer_array(vetor, intro_sort),
+		'list.sort': lambda vetor: lista(vetor, list.sort),
+		'ndarray.sort': lambda vetor: buffer_numpy(vetor, np.ndarray.sort),
+	}
+	if executar_lentos:
+		algoritmos['Insertion (lista)'] = lambda vetor: lista(vetor, insertion_sort)
+		algoritmos['Insertion (array)'] = lambda vetor: buffer_array(vetor, insertion_sort_buffer)
+
+	tempos_medias = {alg: [] for alg in algoritmos}
+	tempos_desvios = {alg: [] for alg in algoritmos}
+
+	for n in ns:
+		resultados_rodadas = {alg: [] for alg in algoritmos}
+		for _ in range(quantidade_vetores):
+			vetor_aleatorio = [random.randint(0, n) for _ in range(n)]
+			for alg, medir in algoritmos.items():
+				resultados_rodadas[alg].append(medir(vetor_aleatorio))
+		print(f"N={n}:")
+		for alg in algoritmos:
+			tempos_medias[alg].append(np.mean(resultados_rodadas[alg]))
+			tempos_desvios[alg].append(np.std(resultados_rodadas[alg]))
+			print(f"\t{alg:18s} {tempos_medias[alg][-1]:.4f} s")
+
+	if mostrar_grafico:
+		plt.figure(figsize=(10, 6))
+		for alg in algoritmos:
+			plt.errorbar(ns, tempos_medias[alg], yerr=tempos_desvios[alg], fmt='-o', label=alg, capsize=5)
+		plt.xlabel('n do Vetor (N)')
+		plt.ylabel('Tempo Médio (segundos)')
+		plt.title(f'Listas x Buffers Tipados (Média de {quantidade_vetores} Execuções)')
+		plt.yscale('log')
+		plt.legend()
+		plt.grid(True)
+		plt.tight_layout()
+		plt.show()
+
+	return tempos_medias
+
+
 if __name__ == "__main__":
 
 	# Vetor desordenado
@@ -317,5 +649,48 @@ if __name__ == "__main__":
 	# Impressao do vetor
 	print(l1)
 
+	# Versões para buffers: array('i'), array('q'), NumPy int32/float64,
+	# visão com passo do NumPy e bytearray
+	from array import array
+	entradas = [[], [5], list(range(300)), list(range(300, 0, -1)), [2] * 100,
+				[random.randint(0, 3) for _ in range(300)], [random.randint(-1000, 1000) for _ in range(300)]]
+	for ordena in (insertion_sort_buffer, selection_sort_buffer, bubble_sort_buffer, merge_sort_buffer, quick_sort_buffer):
+		for entrada in entradas:
+			for V in (array('i', entrada), array('q', entrada), np.array(entrada, dtype=np.int32),
+					  np.array(entrada, dtype=np.float64)):
+				ordena(V)
+				assert list(V) == sorted(entrada)
+			base = np.full(2 * len(entrada), -7, dtype=np.int64)
+			base[::2] = entrada
+			V = base[::2]
+			ordena(V)
+			assert V.tolist() == sorted(entrada) and (base[1::2] == -7).all()
+			positivos = [x % 256 for x in entrada]
+			V = bytearray(positivos)
+			ordena(V)
+			assert list(V) == sorted(positivos)
+	quick_sort_buffer(array('i', range(3000)))		# ordenado: sem RecursionError
+
+	# Introsort em entradas que levam quick_sort ao pior caso
+	for entrada in ([], [1], list(range(10**5)), list(range(10**5, 0, -1)), [7] * 10**5,
+					[random.randint(0, 3) for _ in range(10**5)], [random.random() for _ in range(10**4)]):
+		V = entrada.copy()
+		intro_sort(V)
+		assert V == sorted(entrada)
+
+	# Heapsort de recurso: profundidade 0 desde o início, e heap_sort em um
+	# subintervalo sem tocar no restante do vetor
+	for entrada in ([], [4], list(range(1000)), [3] * 500, [random.randint(-50, 50) for _ in range(2000)]):
+		V = entrada.copy()
+		_intro_sort(V, 0, len(V) - 1, 0)
+		assert V == sorted(entrada)
+	entrada = [random.randint(0, 100) for _ in range(1000)]
+	for i, j in ((0, 999), (100, 700), (500, 500), (998, 999)):
+		V = entrada.copy()
+		heap_sort(V, i, j)
+		assert V[i:j + 1] == sorted(entrada[i:j + 1])
+		assert V[:i] == entrada[:i] and V[j + 1:] == entrada[j + 1:]
+
 	debug = False
 	#benchmark()
+	#benchmark_buffers()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Algoritmo de Prim para arvore geradora minima.
+
+Alternativa a `kruskal.py` que nao ordena todas as arestas: a arvore cresce
+a partir de um nodo, sempre incluindo a aresta mais barata que liga a arvore
+a um nodo ainda de fora. Dois motores estao disponiveis:
+
+- 'heap':   heap binario indexado com decrease-key, O(E log V).
+            Adequado a grafos esparsos.
+- 'matriz': vetor de custos e busca linear do minimo, O(V^2).
+            Adequado a grafos densos (ex.: grafos completos), pois nao paga
+            o fator log V por aresta.
+
+Com modo='auto' o motor e escolhido pela densidade: usamos a matriz quando
+E * log2(V) >= V^2, isto e, quando o custo estimado do heap passa o da matriz.
+
+Entradas aceitas:
+
+- prim(v, e): mesmo formato de `kruskal(v, e)`, com v a lista de nodos e e a
+  lista de arestas ((x, y), peso). Devolve as arestas de e escolhidas.
+- prim_adj(g): lista de adjacencia {nodo: [(vizinho, peso), ...]}, no formato
+  de `heapdijkstra.py`. Devolve arestas ((x, y), peso) como aparecem em g.
+
+Se o grafo for desconexo, ambas devolvem uma floresta geradora minima.
+"""
+
+import math
+
+
+class HeapIndexado:
+    """
+    Heap binario minimo sobre os itens 0, ..., n-1, com posicao de cada item.
+
+    Conhecer a posicao permite diminuir a chave de um item ja presente em
+    O(log n), sem inserir copias obsoletas (como faz `heapdijkstra.py`).
+    """
+
+    def __init__(self, n):
+        self.heap = []            # itens, organizados como heap
+        self.pos = [-1] * n       # pos[i] = indice de i em heap, ou -1
+        self.chave = [None] * n   # chave atual de cada item
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, i):
+        return self.pos[i] != -1
+
+    def _troca(self, a, b):
+        h = self.heap
+        h[a], h[b] = h[b], h[a]
+        self.pos[h[a]] = a
+        self.pos[h[b]] = b
+
+    def _sobe(self, k):
+        h, c = self.heap, self.chave
+        while k > 0:
+            pai = (k - 1) // 2
+            if c[h[k]] < c[h[pai]]:
+                self._troca(k, pai)
+                k = pai
+            else:
+                break
+
+    def _desce(self, k):
+        h, c = self.heap, self.chave
+        n = len(h)
+        while True:
+            menor = k
+            for f in (2 * k + 1, 2 * k + 2):
+                if f < n and c[h[f]] < c[h[menor]]:
+                    menor = f
+            if menor == k:
+                break
+            self._troca(k, menor)
+            k = menor
+
+    def insere_ou_diminui(self, i, chave):
+        """Insere i com a chave dada ou diminui sua chave. Devolve True se mudou."""
+        if self.pos[i] == -1:
+            self.chave[i] = chave
+            self.heap.append(i)
+            self.pos[i] = len(self.heap) - 1
+            self._sobe(self.pos[i])
+            return True
+        if chave < self.chave[i]:
+            self.chave[i] = chave
+            self._sobe(self.pos[i])
+            return True
+        return False
+
+    def remove_minimo(self):
+        h = self.heap
+        i = h[0]
+        self._troca(0, len(h) - 1)
+        h.pop()
+        self.pos[i] = -1
+        if h:
+            self._desce(0)
+        return i
+
+
+def _prim_heap(n, adj):
+    """
+    Prim com heap indexado sobre nodos 0..n-1.
+    adj[x] = lista de (y, peso, id_aresta). Devolve lista de id_aresta.
+    """
+    dentro = [False] * n
+    aresta = [-1] * n        # aresta mais barata que liga o nodo a arvore
+    heap = HeapIndexado(n)
+    res = []
+
+    for raiz in range(n):
+        if dentro[raiz]:
+            continue
+        heap.insere_ou_diminui(raiz, 0)
+        while len(heap) > 0:
+            x = heap.remove_minimo()
+            dentro[x] = True
+            if aresta[x] != -1:
+                res.append(aresta[x])
+            for (y, peso, a) in adj[x]:
+                if not dentro[y] and heap.insere_ou_diminui(y, peso):
+                    aresta[y] = a
+    return res
+
+
+def _prim_matriz(n, adj):
+    """
+    Prim em O(V^2) sobre nodos 0..n-1, com vetores de custo e busca linear.
+    adj[x] = lista de (y, peso, id_aresta). Devolve lista de id_aresta.
+    """
+    # matriz de custos: guarda apenas a aresta mais barata entre cada par
+    inf = math.inf
+    custo = [[inf] * n for _ in range(n)]
+    ident = [[-1] * n for _ in range(n)]
+    for x in range(n):
+        cx, ix = custo[x], ident[x]
+        for (y, peso, a) in adj[x]:
+            if peso < cx[y]:
+                cx[y] = peso
+                ix[y] = a
+
+    dentro = [False] * n
+    dist = [inf] * n         # custo da aresta mais barata ate a arvore
+    aresta = [-1] * n
+    res = []
+
+    for raiz in range(n):
+        if dentro[raiz]:
+            continue
+        dist[raiz] = 0
+        while True:
+            # busca linear do nodo de fora mais proximo da arvore
+            x, melhor = -1, inf
+            for y in range(n):
+                if not dentro[y] and dist[y] < melhor:
+                    x, melhor = y, dist[y]
+            if x == -1:
+                break        # componente de raiz esgotado
+            dentro[x] = True
+            if aresta[x] != -1:
+                res.append(aresta[x])
+            cx, ix = custo[x], ident[x]
+            for y in range(n):
+                if not dentro[y] and cx[y] < dist[y]:
+                    dist[y] = cx[y]
+                    aresta[y] = ix[y]
+    return res
+
+
+def _escolhe_modo(n, m, modo):
+    if modo == 'auto':
+        return 'matriz' if n > 1 and m * math.log2(n) >= n * n else 'heap'
+    if modo not in ('heap', 'matriz'):
+        raise ValueError("modo deve ser 'auto', 'heap' ou 'matriz'.")
+    return modo
+
+
+def _executa(n, adj, m, modo):
+    if _escolhe_modo(n, m, modo) == 'matriz':
+        return _prim_matriz(n, adj)
+    return _prim_heap(n, adj)
+
+
+def prim(v, e, modo='auto'):
+    """
+    Prim com a mesma entrada de `kruskal(v, e)`. Devolve as arestas de e que
+    formam a arvore (ou floresta) geradora minima, na ordem de insercao.
+    """
+    nome = {x: i for i, x in enumerate(v)}
+    adj = [[] for _ in v]
+    for a, ((x, y), peso) in enumerate(e):
+        i, j = nome[x], nome[y]
+        adj[i].append((j, peso, a))
+        adj[j].append((i, peso, a))
+    return [e[a] for a in _executa(len(v), adj, len(e), modo)]
+
+
+def prim_adj(g, modo='auto'):
+    """
+    Prim sobre lista de adjacencia {nodo: [(vizinho, peso), ...]} de um grafo
+    nao direcionado (cada aresta aparece nas listas dos dois extremos).
+    Devolve arestas ((x, y), peso) como aparecem em g.
+    """
+    nos = list(g.keys())
+    for x in g:
+        for (y, _) in g[x]:
+            if y not in g:
+                nos.append(y)
+    nome = {x: i for i, x in enumerate(dict.fromkeys(nos))}
+    nos = list(nome)
+
+    adj = [[] for _ in nos]
+    arestas = []
+    for x in g:
+        for (y, peso) in g[x]:
+            a = len(arestas)
+            arestas.append(((x, y), peso))
+            adj[nome[x]].append((nome[y], peso, a))
+            adj[nome[y]].append((nome[x], peso, a))
+
+    return [arestas[a] for a in _executa(len(nos), adj, len(arestas) // 2, modo)]
+
+
+def _custo(arvore):
+    return sum(peso for (_, peso) in arvore)
+
+
+def _run_tests():
+    import random
+    from kruskal import kruskal, v, e
+
+    for modo in ('heap', 'matriz', 'auto'):
+        assert _custo(prim(v, e, modo)) == _custo(kruskal(v, e))
+        assert len(prim(v, e, modo)) == len(v) - 1
+
+    # pesos distintos: a arvore minima e unica, logo igual a de Kruskal
+    rng = random.Random(0)
+    for n, m in ((30, 60), (30, 400), (50, 1225)):
+        vs = list(range(n))
+        pesos = rng.sample(range(10 * m), m)
+        es = [((rng.randrange(n), rng.randrange(n)), pesos[i]) for i in range(m)]
+        k = set(kruskal(vs, es))
+        for modo in ('heap', 'matriz', 'auto'):
+            assert set(prim(vs, es, modo)) == k
+
+    # lista de adjacencia (grafo desconexo com dois componentes)
+    g = {
+        'a': [('b', 1), ('c', 4)],
+        'b': [('a', 1), ('c', 2)],
+        'c': [('a', 4), ('b', 2)],
+        'x': [('y', 7)],
+        'y': [('x', 7)],
+    }
+    for modo in ('heap', 'matriz'):
+        floresta = prim_adj(g, modo)
+        assert len(floresta) == 3 and _custo(floresta) == 10
+
+    print("Todos os testes de Prim passaram.")
+
+
+if __name__ == "__main__":
+    _run_tests()
+
+    import random
+    import time
+    from kruskal import kruskal
+
+    # grafo completo: o modo matriz evita ordenar V^2/2 arestas
+    n = 300
+    vs = list(range(n))
+    es = [((i, j), random.random()) for i in range(n) for j in range(i + 1, n)]
+    for nome, f in (('kruskal', lambda: kruskal(vs, es)),
+                    ('prim heap', lambda: prim(vs, es, 'heap')),
+                    ('prim matriz', lambda: prim(vs, es, 'matriz'))):
+        inicio = time.time()
+        f()
+        print(nome, time.time() - inicio, "segundos")
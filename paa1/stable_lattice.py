@@ -0,0 +1,440 @@
+# Prof. Bruno Iochins Grisci
+"""
+All stable matchings of a bipartite instance via the rotation poset
+(Gusfield & Irving, "The Stable Marriage Problem", 1989).
+
+gale_shapley returns the man-optimal stable matching M0. Every other stable
+matching is obtained from M0 by eliminating a set of rotations, the same
+objects Irving's algorithm (irving.py) eliminates in its phase 2:
+
+  - in a stable matching M, let s(m) be the first woman after M(m) in m's
+    list who prefers m to her partner, and next(m) = M(s(m));
+  - following next from any man not yet at his woman-optimal partner closes
+    a cycle (m0, w0), ..., (mk-1, wk-1): an exposed rotation;
+  - eliminating it gives each mi the woman w(i+1): a new stable matching.
+
+Eliminating exposed rotations from M0 until the woman-optimal matching finds
+every rotation exactly once. The precedence between rotations is generated by
+two kinds of edges:
+  1. consecutive rotations that move the same man;
+  2. if a rotation moves m from wi to w(i+1) and w lies strictly between them
+     in m's list, the rotation that moves w from a partner she likes less
+     than m to one she likes more must come first.
+
+Stable matchings correspond one-to-one to the closed subsets (down-sets) of
+this poset, so they can be listed lazily by a depth-first search that decides
+each rotation in topological order. Each rotation also changes the total rank
+(sum over everyone of the position of their partner) by a fixed amount, so
+the egalitarian stable matching is a minimum-weight closed subset, found by a
+minimum cut (Picard's reduction). The minimum-regret matching is found by
+testing, for increasing thresholds k, whether the rotations needed to bring
+every woman to rank <= k are compatible with keeping every man at rank <= k.
+
+Ranks are 0-based, as in the rank tables of galeshapley.py. Complete
+preference lists are assumed.
+"""
+
+from collections import deque
+
+from galeshapley import gale_shapley
+
+
+class RotationPoset:
+
+    def __init__(self, m_prefs: dict[str, list[str]], w_prefs: dict[str, list[str]]):
+        self.men = list(m_prefs.keys())
+        self.women = list(w_prefs.keys())
+        m_id = {m: i for i, m in enumerate(self.men)}
+        w_id = {w: i for i, w in enumerate(self.women)}
+        n = len(self.men)
+        self.pref = [[w_id[w] for w in m_prefs[m]] for m in self.men]
+        self.m_rank = [[0] * n for _ in range(n)]
+        self.w_rank = [[0] * n for _ in range(n)]
+        for m in range(n):
+            for k, w in enumerate(self.pref[m]):
+                self.m_rank[m][w] = k
+        for w, name in enumerate(self.women):
+            for k, m in enumerate(w_prefs[name]):
+                self.w_rank[w][m_id[m]] = k
+
+        # man-optimal and woman-optimal stable matchings
+        self.m0 = [0] * n
+        for m, w in gale_shapley(m_prefs, w_prefs)[0]:
+            self.m0[m_id[m]] = w_id[w]
+        m_z = [0] * n
+        for w, m in gale_shapley(w_prefs, m_prefs)[0]:
+            m_z[m_id[m]] = w_id[w]
+        self.h0 = [0] * n
+        for m, w in enumerate(self.m0):
+            self.h0[w] = m
+
+        self.rotations = self._find_rotations(m_z)
+        self.preds = self._precedence()
+        self.delta = [self._delta(r) for r in self.rotations]
+        self.base_cost = sum(self.m_rank[m][w] + self.w_rank[w][m] for m, w in enumerate(self.m0))
+
+    # ------------------------------------------------------------------
+    # construction
+
+    def _find_rotations(self, m_z):
+        """Eliminate exposed rotations from M0 until the woman-optimal matching."""
+        pref, m_rank, w_rank = self.pref, self.m_rank, self.w_rank
+        wife = self.m0[:]
+        husband = [0] * len(wife)
+        for m, w in enumerate(wife):
+            husband[w] = m
+
+        rotations = []
+        pending = [m for m in range(len(wife)) if wife[m] != m_z[m]]
+        while pending:
+            start = pending[-1]
+            if wife[start] == m_z[start]:
+                pending.pop()
+                continue
+            # p-sequence, as in Irving's phase 2: follow next() until a man repeats
+            seen = {}
+            seq = []
+            m = start
+            while m not in seen:
+                seen[m] = len(seq)
+                seq.append(m)
+                k = m_rank[m][wife[m]] + 1
+                while w_rank[pref[m][k]][m] > w_rank[pref[m][k]][husband[pref[m][k]]]:
+                    k += 1
+                m = husband[pref[m][k]]
+            cycle = seq[seen[m]:]
+            rotation = [(x, wife[x]) for x in cycle]
+            rotations.append(rotation)
+            for i, (x, _) in enumerate(rotation):
+                w_next = rotation[(i + 1) % len(rotation)][1]
+                wife[x] = w_next
+                husband[w_next] = x
+        return rotations
+
+    def _precedence(self):
+        """preds[r] = rotations that must be eliminated before r (generating edges)."""
+        n = len(self.men)
+        preds = [set() for _ in self.rotations]
+        last_for_man = [-1] * n
+        moves_woman = [[] for _ in range(n)]     # per woman: (rotation, new partner), in order
+        for r, rotation in enumerate(self.rotations):
+            for i, (m, _) in enumerate(rotation):
+                if last_for_man[m] != -1:
+                    preds[r].add(last_for_man[m])                     # type 1
+                last_for_man[m] = r
+                w_next = rotation[(i + 1) % len(rotation)][1]
+                moves_woman[w_next].append((r, m))
+
+        for r, rotation in enumerate(self.rotations):
+            for i, (m, w_i) in enumerate(rotation):
+                w_next = rotation[(i + 1) % len(rotation)][1]
+                for k in range(self.m_rank[m][w_i] + 1, self.m_rank[m][w_next]):
+                    w = self.pref[m][k]                                # type 2
+                    below = self.w_rank[w][self.h0[w]] > self.w_rank[w][m]
+                    for r2, new in moves_woman[w]:
+                        if self.w_rank[w][new] < self.w_rank[w][m]:
+                            if below and r2 != r:
+                                preds[r].add(r2)
+                            break
+                        below = True
+        return preds
+
+    def _delta(self, rotation):
+        """Change in total rank when the rotation is eliminated."""
+        d = 0
+        for i, (m, w) in enumerate(rotation):
+            m_next, w_next = rotation[(i + 1) % len(rotation)]
+            d += self.m_rank[m][w_next] - self.m_rank[m][w]
+            d += self.w_rank[w_next][m] - self.w_rank[w_next][m_next]
+        return d
+
+    # ------------------------------------------------------------------
+    # matchings from sets of rotations
+
+    def _wives(self, chosen):
+        wife = self.m0[:]
+        for r in sorted(chosen):                 # discovery order is a topological order
+            rotation = self.rotations[r]
+            for i, (m, _) in enumerate(rotation):
+                wife[m] = rotation[(i + 1) % len(rotation)][1]
+        return wife
+
+    def matching(self, chosen=()):
+        """Stable matching (set of (man, woman)) after eliminating a closed set of rotations."""
+        return {(self.men[m], self.women[w]) for m, w in enumerate(self._wives(chosen))}
+
+    def down_closure(self, rotations):
+        closed = set()
+        stack = list(rotations)
+        while stack:
+            r = stack.pop()
+            if r not in closed:
+                closed.add(r)
+                stack.extend(self.preds[r])
+        return closed
+
+    def stable_matchings(self):
+        """Generator over all stable matchings (each exactly once)."""
+        wife = self.m0[:]
+        chosen = [False] * len(self.rotations)
+
+        # Iterative DFS (the poset may have thousands of rotations). Frame
+        # [r, state]: 0 = explore with r not eliminated, 1 = explore with r
+        # eliminated (if its predecessors are), 2 = undo r and backtrack.
+        k = len(self.rotations)
+        stack = [[0, 0]]
+        while stack:
+            frame = stack[-1]
+            r, state = frame
+            if r == k:
+                stack.pop()
+                yield {(self.men[m], self.women[w]) for m, w in enumerate(wife)}
+            elif state == 0:
+                frame[1] = 1
+                stack.append([r + 1, 0])
+            elif state == 1 and all(chosen[p] for p in self.preds[r]):
+                rotation = self.rotations[r]
+                chosen[r] = True
+                for i, (m, _) in enumerate(rotation):
+                    wife[m] = rotation[(i + 1) % len(rotation)][1]
+                frame[1] = 2
+                stack.append([r + 1, 0])
+            else:
+                if state == 2:
+                    for m, w in self.rotations[r]:
+                        wife[m] = w
+                    chosen[r] = False
+                stack.pop()
+
+    # ------------------------------------------------------------------
+    # optimal stable matchings
+
+    def cost(self, pairs):
+        m_id = {m: i for i, m in enumerate(self.men)}
+        w_id = {w: i for i, w in enumerate(self.women)}
+        return sum(self.m_rank[m_id[m]][w_id[w]] + self.w_rank[w_id[w]][m_id[m]] for m, w in pairs)
+
+    def egalitarian(self):
+        """
+        Stable matching of minimum total rank, via maximum-weight closure:
+        source -> r with capacity -delta(r) when eliminating r helps, r -> sink
+        with capacity delta(r) otherwise, r -> each predecessor with infinite
+        capacity. The source side of a minimum cut is the optimal closed set.
+        Returns (matching, total rank).
+        """
+        k = len(self.rotations)
+        source, sink = k, k + 1
+        graph = _FlowGraph(k + 2)
+        infinite = sum(abs(d) for d in self.delta) + 1
+        for r, d in enumerate(self.delta):
+            if d < 0:
+                graph.add_edge(source, r, -d)
+            elif d > 0:
+                graph.add_edge(r, sink, d)
+            for p in self.preds[r]:
+                graph.add_edge(r, p, infinite)
+        graph.max_flow(source, sink)
+        chosen = graph.source_side(source) - {source}
+        return self.matching(chosen), self.base_cost + sum(self.delta[r] for r in chosen)
+
+    def minimum_regret(self):
+        """Stable matching minimizing the worst rank anyone gets. Returns (matching, regret)."""
+        n = len(self.men)
+        # per man / woman, the rotations that move them, with the new rank
+        man_moves = [[] for _ in range(n)]
+        woman_moves = [[] for _ in range(n)]
+        for r, rotation in enumerate(self.rotations):
+            for i, (m, _) in enumerate(rotation):
+                w_next = rotation[(i + 1) % len(rotation)][1]
+                man_moves[m].append((r, self.m_rank[m][w_next]))
+                woman_moves[w_next].append((r, self.w_rank[w_next][m]))
+
+        # men only get worse partners, so k is at least their worst rank in M0
+        for k in range(max(self.m_rank[m][w] for m, w in enumerate(self.m0)), n):
+            forbidden = {r for moves in man_moves for r, rank in moves if rank > k}
+            required = set()
+            feasible = True
+            for w in range(n):
+                if self.w_rank[w][self.h0[w]] <= k:
+                    continue
+                r = next((r for r, rank in woman_moves[w] if rank <= k), None)
+                if r is None:
+                    feasible = False
+                    break
+                required.add(r)
+            if not feasible:
+                continue
+            closed = self.down_closure(required)
+            if not closed & forbidden:
+                return self.matching(closed), k
+        raise AssertionError("the man-optimal matching has regret < n")
+
+
+class _FlowGraph:
+    """Dinic's maximum flow on an adjacency list of edge indices."""
+
+    def __init__(self, n):
+        self.adj = [[] for _ in range(n)]
+        self.to = []
+        self.cap = []
+
+    def add_edge(self, u, v, c):
+        self.adj[u].append(len(self.to))
+        self.to.append(v)
+        self.cap.append(c)
+        self.adj[v].append(len(self.to))
+        self.to.append(u)
+        self.cap.append(0)
+
+    def _levels(self, s):
+        level = [-1] * len(self.adj)
+        level[s] = 0
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            for e in self.adj[u]:
+                if self.cap[e] > 0 and level[self.to[e]] < 0:
+                    level[self.to[e]] = level[u] + 1
+                    queue.append(self.to[e])
+        return level
+
+    def max_flow(self, s, t):
+        flow = 0
+        while True:
+            level = self._levels(s)
+            if level[t] < 0:
+                return flow
+            it = [0] * len(self.adj)
+            while True:
+                # iterative DFS for one blocking-flow augmenting path
+                path = []
+                u = s
+                while u != t:
+                    while it[u] < len(self.adj[u]):
+                        e = self.adj[u][it[u]]
+                        if self.cap[e] > 0 and level[self.to[e]] == level[u] + 1:
+                            break
+                        it[u] += 1
+                    if it[u] == len(self.adj[u]):
+                        if not path:
+                            break
+                        level[u] = -1                 # dead end
+                        u = self.to[path.pop() ^ 1]
+                        continue
+                    e = self.adj[u][it[u]]
+                    path.append(e)
+                    u = self.to[e]
+                if u != t:
+                    break
+                push = min(self.cap[e] for e in path)
+                for e in path:
+                    self.cap[e] -= push
+                    self.cap[e ^ 1] += push
+                flow += push
+
+    def source_side(self, s):
+        seen = {s}
+        stack = [s]
+        while stack:
+            u = stack.pop()
+            for e in self.adj[u]:
+                if self.cap[e] > 0 and self.to[e] not in seen:
+                    seen.add(self.to[e])
+                    stack.append(self.to[e])
+        return seen
+
+
+def _all_stable_brute_force(m_prefs, w_prefs):
+    from itertools import permutations
+    from matching_stability import blocking_pairs_gale_shapley
+
+    men, women = list(m_prefs), list(w_prefs)
+    result = []
+    for perm in permutations(women):
+        pairs = set(zip(men, perm))
+        if not blocking_pairs_gale_shapley(m_prefs, w_prefs, pairs):
+            result.append(pairs)
+    return result
+
+
+def run_reference_tests():
+    from itertools import islice
+
+    from galeshapley import random_instance
+    from matching_stability import blocking_pairs_gale_shapley
+
+    # Worst case from the lecture slides (see galeshapley.py)
+    HOMENS = {
+        'V': ['A', 'B', 'C', 'D', 'E'],
+        'W': ['B', 'C', 'D', 'A', 'E'],
+        'X': ['C', 'D', 'A', 'B', 'E'],
+        'Y': ['D', 'A', 'B', 'C', 'E'],
+        'Z': ['A', 'B', 'C', 'D', 'E'],
+    }
+    MULHERES = {
+        'A': ['W', 'X', 'Y', 'Z', 'V'],
+        'B': ['X', 'Y', 'Z', 'V', 'W'],
+        'C': ['Y', 'Z', 'V', 'W', 'X'],
+        'D': ['Z', 'V', 'W', 'X', 'Y'],
+        'E': ['V', 'W', 'X', 'Y', 'Z'],
+    }
+    cases = [(HOMENS, MULHERES)] + [random_instance(n, seed=s) for n in (1, 2, 4, 6) for s in range(40)]
+    # a family with many stable matchings: latin-square preferences
+    n = 6
+    cases.append(({f"M{i}": [f"W{(i + k) % n}" for k in range(n)] for i in range(n)},
+                  {f"W{j}": [f"M{(j - k - 1) % n}" for k in range(n)] for j in range(n)}))
+
+    for m_prefs, w_prefs in cases:
+        poset = RotationPoset(m_prefs, w_prefs)
+        brute = _all_stable_brute_force(m_prefs, w_prefs)
+        listed = list(poset.stable_matchings())
+        assert len(listed) == len(brute)
+        assert {frozenset(x) for x in listed} == {frozenset(x) for x in brute}
+
+        matching, cost = poset.egalitarian()
+        assert cost == poset.cost(matching) == min(poset.cost(x) for x in brute)
+        assert matching in brute
+
+        matching, regret = poset.minimum_regret()
+        def worst(pairs):
+            return max(max(m_prefs[m].index(w), w_prefs[w].index(m)) for m, w in pairs)
+        assert regret == worst(matching) == min(worst(x) for x in brute)
+
+    # 1050 independent 2x2 blocks: one rotation per block, no precedence and
+    # 2^1050 stable matchings; the enumeration must not recurse per rotation
+    blocks = 1050
+    n = 2 * blocks
+    m_prefs, w_prefs = {}, {}
+    for b in range(blocks):
+        a, c = 2 * b, 2 * b + 1
+        others = [j for j in range(n) if j != a and j != c]
+        m_prefs[f"M{a}"] = [f"W{j}" for j in [a, c] + others]
+        m_prefs[f"M{c}"] = [f"W{j}" for j in [c, a] + others]
+        w_prefs[f"W{a}"] = [f"M{j}" for j in [c, a] + others]
+        w_prefs[f"W{c}"] = [f"M{j}" for j in [a, c] + others]
+    poset = RotationPoset(m_prefs, w_prefs)
+    assert len(poset.rotations) == blocks and not any(poset.preds)
+    first = list(islice(poset.stable_matchings(), 4))
+    assert first[0] == poset.matching() == {(f"M{i}", f"W{i}") for i in range(n)}
+    assert first[1] == poset.matching([blocks - 1])
+    assert len({frozenset(x) for x in first}) == 4
+    assert not blocking_pairs_gale_shapley(m_prefs, w_prefs, first[3])
+
+    print("All rotation poset reference tests passed.")
+
+
+if __name__ == '__main__':
+    import time
+    from galeshapley import random_instance
+
+    run_reference_tests()
+
+    m_prefs, w_prefs = random_instance(300, seed=0)
+    start = time.perf_counter()
+    poset = RotationPoset(m_prefs, w_prefs)
+    print(f"n=300: {len(poset.rotations)} rotations, {time.perf_counter() - start:.2f} s")
+    count = sum(1 for _ in poset.stable_matchings())
+    print(f"{count} stable matchings")
+    _, cost = poset.egalitarian()
+    _, regret = poset.minimum_regret()
+    print(f"total rank: man-optimal {poset.base_cost}, egalitarian {cost}; minimum regret {regret}")
@@ -0,0 +1,107 @@
+"""
+Escalonamento de intervalos com pesos - Programação Dinâmica
+
+Cada intervalo (inicio, fim, peso) tem um valor (por exemplo, a receita de
+uma reserva) e queremos o subconjunto de intervalos compatíveis de maior
+peso total. O guloso "termina mais cedo" (`terminaMaisCedo` em
+`paa1/intervalos.py`) só é ótimo quando todos os pesos são iguais.
+
+Com os intervalos ordenados por fim, seja p(j) o último intervalo que
+termina antes do início de j (mesma regra de compatibilidade de
+`terminaMaisCedo`: inicio > fim do anterior). Então
+
+    OPT(j) = max(OPT(j - 1), peso(j) + OPT(p(j)))
+
+Cada p(j) é encontrado por busca binária (`bisect`) no vetor de fins, e a
+solução é reconstruída percorrendo a tabela de trás para frente.
+Tempo total O(n log n).
+"""
+
+from bisect import bisect_left
+from typing import List, Tuple
+
+Intervalo = Tuple[int, int, int]
+
+
+def predecessores(fins: List[int], inicios: List[int]) -> List[int]:
+    """p[j] = número de intervalos (na ordem por fim) que terminam antes de inicios[j]."""
+    return [bisect_left(fins, s) for s in inicios]
+
+
+def escalonamento_ponderado(intervalos: List[Intervalo]) -> Tuple[int, List[Intervalo]]:
+    """Retorna o peso máximo e os intervalos escolhidos, em ordem de fim."""
+    lista = sorted(intervalos, key=lambda x: x[1])
+    n = len(lista)
+    inicios = [x[0] for x in lista]
+    fins = [x[1] for x in lista]
+    p = predecessores(fins, inicios)
+
+    # opt[j] = melhor valor usando apenas os j primeiros intervalos
+    opt = [0] * (n + 1)
+    for j in range(1, n + 1):
+        com = lista[j - 1][2] + opt[p[j - 1]]
+        sem = opt[j - 1]
+        opt[j] = com if com > sem else sem
+
+    # reconstrução: o intervalo j entra se usá-lo atinge opt[j]
+    escolhidos = []
+    j = n
+    while j > 0:
+        if lista[j - 1][2] + opt[p[j - 1]] >= opt[j - 1]:
+            escolhidos.append(lista[j - 1])
+            j = p[j - 1]
+        else:
+            j -= 1
+    escolhidos.reverse()
+    return opt[n], escolhidos
+
+
+def forca_bruta(intervalos: List[Intervalo]) -> int:
+    """Testa todos os subconjuntos (apenas para validação com n pequeno)."""
+    n = len(intervalos)
+    melhor = 0
+    for mascara in range(1 << n):
+        sub = sorted((intervalos[i] for i in range(n) if mascara >> i & 1), key=lambda x: x[1])
+        if all(sub[k][0] > sub[k - 1][1] for k in range(1, len(sub))):
+            melhor = max(melhor, sum(x[2] for x in sub))
+    return melhor
+
+
+def _run_tests():
+    import random
+
+    # o guloso por fim escolheria (0,2) e (3,5), peso 2; o ótimo é (1,4), peso 10
+    valor, escolhidos = escalonamento_ponderado([(0, 2, 1), (1, 4, 10), (3, 5, 1)])
+    assert (valor, escolhidos) == (10, [(1, 4, 10)])
+    assert escalonamento_ponderado([]) == (0, [])
+
+    rng = random.Random(0)
+    for _ in range(300):
+        n = rng.randint(1, 10)
+        intervalos = []
+        for _ in range(n):
+            s = rng.randrange(20)
+            intervalos.append((s, s + rng.randrange(6), rng.randint(1, 9)))
+        valor, escolhidos = escalonamento_ponderado(intervalos)
+        assert valor == forca_bruta(intervalos)
+        assert sum(x[2] for x in escolhidos) == valor
+        assert all(escolhidos[k][0] > escolhidos[k - 1][1] for k in range(1, len(escolhidos)))
+
+    print("Todos os testes do escalonamento ponderado passaram.")
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    _run_tests()
+
+    n = 10**6
+    rng = random.Random(1)
+    intervalos = []
+    for _ in range(n):
+        s = rng.randrange(10 * n)
+        intervalos.append((s, s + rng.randint(1, 100), rng.randint(1, 1000)))
+    inicio = time.time()
+    valor, escolhidos = escalonamento_ponderado(intervalos)
+    print(n, "intervalos: peso", valor, "com", len(escolhidos), "intervalos em", time.time() - inicio, "segundos")